@@ -9,10 +9,28 @@ import os
 import sys
 import argparse
 import json
+import functools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image
 import numpy as np
 
+try:
+    from numba import njit, prange, set_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Approximate working-set budget (bytes) for one row tile of the NumPy
+# matching path, sized so a tile's temporaries stay resident in L2 cache
+TILE_BYTES = 1 << 20
+
+# Directory batches larger than this skip per-image output unless told otherwise
+QUIET_BATCH_SIZE = 100
+
 
 def load_config(config_path='config.json'):
     """
@@ -47,97 +65,340 @@ def load_config(config_path='config.json'):
         return {}
 
 
+@functools.lru_cache(maxsize=None)
 def hex_to_rgb(hex_color):
     """Convert hex color code to RGB tuple."""
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
-def remove_background(input_path, output_path, bg_colors='#8DC5FE', tolerance=30):
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _apply_bg_mask(rgb, alpha, bg_colors_arr, tol_sq, row_counts):
+        """
+        Clear alpha of background pixels in a single pass over the image.
+
+        Args:
+            rgb: Color channels (H, W, 3+), uint8
+            alpha: Alpha channel (H, W), uint8, modified in place
+            bg_colors_arr: Background colors (K, 3), int16
+            tol_sq: Squared color matching tolerance
+            row_counts: Output (H, K) int64 array of matched pixels per row and color
+        """
+        height, width = rgb.shape[0], rgb.shape[1]
+        num_colors = bg_colors_arr.shape[0]
+
+        for y in prange(height):
+            # Deinterleave the row into int32 channel planes so the per-color
+            # loop below is branchless over contiguous lanes and LLVM can
+            # vectorize it (AVX2/SSE, depending on the CPU)
+            r = np.empty(width, dtype=np.int32)
+            g = np.empty(width, dtype=np.int32)
+            b = np.empty(width, dtype=np.int32)
+            keep = np.ones(width, dtype=np.int32)
+            for x in range(width):
+                r[x] = rgb[y, x, 0]
+                g[x] = rgb[y, x, 1]
+                b[x] = rgb[y, x, 2]
+
+            for k in range(num_colors):
+                bg_r = np.int32(bg_colors_arr[k, 0])
+                bg_g = np.int32(bg_colors_arr[k, 1])
+                bg_b = np.int32(bg_colors_arr[k, 2])
+                count = 0
+                for x in range(width):
+                    dr = r[x] - bg_r
+                    dg = g[x] - bg_g
+                    db = b[x] - bg_b
+                    hit = np.int32(dr * dr + dg * dg + db * db <= tol_sq)
+                    count += hit
+                    keep[x] &= 1 - hit
+                # Each row is owned by one thread, so no atomics needed
+                row_counts[y, k] = count
+
+            for x in range(width):
+                alpha[y, x] = alpha[y, x] * keep[x]
+
+
+def _apply_bg_mask_numpy(rgb, alpha, bg_colors_arr, tol_sq, count=True):
     """
-    Remove background color(s) from image and create transparent PNG.
+    Clear alpha of background pixels with NumPy, one cache-sized row tile at a time.
+
+    Args:
+        rgb: Color channels (H, W, 3+), uint8
+        alpha: Alpha channel (H, W), uint8, modified in place
+        bg_colors_arr: Background colors (K, 3), int16
+        tol_sq: Squared color matching tolerance
+        count: Whether to count matched pixels per color
+
+    Returns:
+        np.ndarray: Matched pixel count per background color, shape (K,), or None if not counted
+    """
+    height, width = rgb.shape[:2]
+    num_colors = bg_colors_arr.shape[0]
+    tile_rows = max(1, TILE_BYTES // (width * 4 * (num_colors + 2)))
+    pixel_counts = np.zeros(num_colors, dtype=np.int64)
+
+    # Squared channel differences for every possible uint8 level, shape (K, 3, 256),
+    # so each pixel's distance is three table lookups instead of subtract/square passes
+    levels = np.arange(256, dtype=np.int32)
+    sq_luts = (levels[None, None, :] - bg_colors_arr[:, :, None].astype(np.int32)) ** 2
+
+    for y0 in range(0, height, tile_rows):
+        tile = rgb[y0:y0 + tile_rows]
+        r, g, b = tile[:, :, 0], tile[:, :, 1], tile[:, :, 2]
+        combined_mask = np.zeros(r.shape, dtype=bool)
+
+        for k in range(num_colors):
+            # Squared Euclidean distance from this background color.
+            # Comparing against tolerance**2 avoids the sqrt entirely.
+            sq_dist = sq_luts[k, 0][r]
+            sq_dist += sq_luts[k, 1][g]
+            sq_dist += sq_luts[k, 2][b]
+
+            # Create mask: pixels within tolerance of this background color
+            mask = sq_dist <= tol_sq
+            if count:
+                pixel_counts[k] += np.count_nonzero(mask)
+            combined_mask |= mask
+
+        # Set alpha channel to 0 (transparent) for background pixels
+        alpha[y0:y0 + tile_rows][combined_mask] = 0
+
+    return pixel_counts if count else None
+
+
+def _decode_image(input_path):
+    """
+    Load an image as color channels plus a writable alpha channel.
 
     Args:
         input_path (str): Path to input image
-        output_path (str): Path to output PNG file
-        bg_colors (str or list): Single color or list of background colors to remove (hex format)
-        tolerance (int): Color matching tolerance (0-255). Higher values match more similar colors.
 
     Returns:
-        bool: True if successful, False otherwise
+        tuple: (img, data, rgb, alpha). data is the RGBA array backing rgb and alpha,
+            or None for opaque sources whose alpha is a separate plane.
     """
-    try:
-        # Load image
-        img = Image.open(input_path)
+    # Load image
+    img = Image.open(input_path)
 
-        # Convert to RGBA if not already
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
+    if img.mode in ('RGB', 'L'):
+        # Opaque source: match on the 3 color channels only and build
+        # the alpha channel separately instead of decoding to RGBA
+        if img.mode == 'L':
+            img = img.convert('RGB')
+        rgb = np.asarray(img)
+        alpha = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+        return img, None, rgb, alpha
 
-        # Convert to numpy array for efficient processing
-        data = np.array(img)
+    # Convert to RGBA if not already
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
 
-        # Normalize bg_colors to list
-        if isinstance(bg_colors, str):
-            bg_colors = [bg_colors]
+    # Convert to numpy array for efficient processing
+    # (a writable copy, since the alpha channel is modified in place)
+    data = np.array(img)
+    return img, data, data[:, :, :3], data[:, :, 3]
 
-        # Calculate color distance for each pixel
-        r, g, b, a = data[:, :, 0], data[:, :, 1], data[:, :, 2], data[:, :, 3]
 
-        # Initialize combined mask
-        combined_mask = np.zeros((data.shape[0], data.shape[1]), dtype=bool)
+def _resolve_colors(bg_colors, color_labels=None):
+    """
+    Normalize background colors to hex labels and a (K, 3) int16 RGB array.
 
-        # Process each background color
-        pixels_removed_per_color = []
-        for bg_color in bg_colors:
-            # Get RGB values of background color
-            bg_rgb = hex_to_rgb(bg_color)
+    Args:
+        bg_colors (str, list or np.ndarray): Hex color(s) or an already resolved RGB array
+        color_labels (list): Hex colors the array was resolved from, used as its labels
 
-            # Calculate Euclidean distance from background color
-            color_diff = np.sqrt(
-                (r.astype(int) - bg_rgb[0]) ** 2 +
-                (g.astype(int) - bg_rgb[1]) ** 2 +
-                (b.astype(int) - bg_rgb[2]) ** 2
-            )
+    Returns:
+        tuple: (list of hex labels, np.ndarray of shape (K, 3))
+    """
+    # Channel differences fit in int16 ([-255, 255]); squares are summed in int32
+    if isinstance(bg_colors, np.ndarray):
+        bg_arr = bg_colors.astype(np.int16, copy=False)
+        if color_labels is None:
+            color_labels = ['#{:02X}{:02X}{:02X}'.format(*color) for color in bg_arr]
+        return list(color_labels), bg_arr
 
-            # Create mask: pixels within tolerance of background color
-            mask = color_diff <= tolerance
+    if isinstance(bg_colors, str):
+        bg_colors = [bg_colors]
+    return list(bg_colors), np.array([hex_to_rgb(c) for c in bg_colors], dtype=np.int16)
 
-            # Count pixels for this color
-            pixels_removed_per_color.append((bg_color, np.sum(mask)))
 
-            # Combine with overall mask using OR
-            combined_mask = combined_mask | mask
+def _match_background(rgb, alpha, bg_arr, tolerance, count=True):
+    """
+    Clear alpha of pixels within tolerance of any background color.
 
-        # Set alpha channel to 0 (transparent) for background pixels
-        data[:, :, 3] = np.where(combined_mask, 0, a)
+    Returns:
+        np.ndarray: Matched pixel count per background color, shape (K,), or None if not counted
+    """
+    tol_sq = tolerance * tolerance
 
-        # Convert back to PIL Image
-        result = Image.fromarray(data, 'RGBA')
+    if NUMBA_AVAILABLE:
+        # Match and clear alpha in one streaming pass, no H x W temporaries
+        row_counts = np.zeros((rgb.shape[0], bg_arr.shape[0]), dtype=np.int64)
+        _apply_bg_mask(rgb, alpha, bg_arr, tol_sq, row_counts)
+        return row_counts.sum(axis=0) if count else None
 
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+    return _apply_bg_mask_numpy(rgb, alpha, bg_arr, tol_sq, count)
 
-        # Save as PNG
-        result.save(output_path, 'PNG')
 
-        print(f"✓ Successfully processed: {input_path}")
-        if len(bg_colors) == 1:
-            print(f"  → Removed color: {bg_colors[0]} ({pixels_removed_per_color[0][1]} pixels)")
-        else:
-            print(f"  → Removed {len(bg_colors)} colors:")
-            for color, pixel_count in pixels_removed_per_color:
-                print(f"     • {color}: {pixel_count} pixels")
-        print(f"  → Saved to: {output_path}")
+def _encode_image(img, data, alpha, output_path, compress_level):
+    """Assemble the transparent result image and save it as PNG."""
+    if data is None:
+        # Attach the computed alpha channel to the RGB source image
+        img.putalpha(Image.frombuffer('L', img.size, alpha, 'raw', 'L', 0, 1))
+        result = img
+    else:
+        # Wrap the array back into a PIL Image without another copy
+        result = Image.frombuffer('RGBA', img.size, data, 'raw', 'RGBA', 0, 1)
+
+    # Save as PNG
+    result.save(output_path, 'PNG', compress_level=compress_level, optimize=False)
+
+
+def _print_result(input_path, output_path, bg_colors, pixel_counts):
+    """Print the per-image summary."""
+    print(f"✓ Successfully processed: {input_path}")
+    if len(bg_colors) == 1:
+        print(f"  → Removed color: {bg_colors[0]} ({pixel_counts[0]} pixels)")
+    else:
+        print(f"  → Removed {len(bg_colors)} colors:")
+        for color, pixel_count in zip(bg_colors, pixel_counts):
+            print(f"     • {color}: {pixel_count} pixels")
+    print(f"  → Saved to: {output_path}")
 
+
+def _print_error(input_path, error):
+    """Print a per-image failure."""
+    print(f"✗ Error processing {input_path}: {str(error)}", file=sys.stderr)
+
+
+def remove_background(input_path, output_path, bg_colors='#8DC5FE', tolerance=30, compress_level=1,
+                      quiet=False, color_labels=None):
+    """
+    Remove background color(s) from image and create transparent PNG.
+
+    Args:
+        input_path (str): Path to input image
+        output_path (str): Path to output PNG file (its directory must already exist)
+        bg_colors (str, list or np.ndarray): Single color or list of background colors to remove
+            (hex format), or an already resolved (K, 3) int16 RGB array
+        tolerance (int): Color matching tolerance (0-255). Higher values match more similar colors.
+        compress_level (int): PNG zlib compression level (0-9). Lower is faster, larger files.
+        quiet (bool): Skip pixel counting and the per-image summary (errors are still reported)
+        color_labels (list): Hex colors shown in the summary when bg_colors is an RGB array
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        img, data, rgb, alpha = _decode_image(input_path)
+        bg_colors, bg_arr = _resolve_colors(bg_colors, color_labels)
+        pixel_counts = _match_background(rgb, alpha, bg_arr, tolerance, count=not quiet)
+        _encode_image(img, data, alpha, output_path, compress_level)
+        if not quiet:
+            _print_result(input_path, output_path, bg_colors, pixel_counts)
         return True
 
     except Exception as e:
-        print(f"✗ Error processing {input_path}: {str(e)}", file=sys.stderr)
+        _print_error(input_path, e)
         return False
 
 
-def process_directory(input_dir, output_dir, bg_colors='#8DC5FE', tolerance=30):
+def _init_worker():
+    """
+    Run the Numba kernel on one thread in each pool worker. The pool already
+    occupies every core, and a full Numba thread pool per worker would oversubscribe them.
+    """
+    if NUMBA_AVAILABLE:
+        set_num_threads(1)
+
+
+def _process_file(args):
+    """Run remove_background on one (input, output, colors, tolerance, compress_level, quiet, labels) tuple in a worker process."""
+    return remove_background(*args)
+
+
+def _run_pipeline(jobs, queue_depth=4):
+    """
+    Run jobs through three overlapping stages in one process: a decoder thread,
+    background matching on the calling thread, and an encoder thread.
+
+    Pillow releases the GIL while decoding and encoding, so file I/O and
+    compression overlap with the matching kernel of neighbouring images.
+
+    Args:
+        jobs (list): (input, output, colors, tolerance, compress_level, quiet, labels) tuples
+        queue_depth (int): Maximum images buffered between stages
+
+    Returns:
+        list: Success flag per job
+    """
+    decoded = queue.Queue(maxsize=queue_depth)
+    matched = queue.Queue(maxsize=queue_depth)
+    results = []
+
+    def decode_stage():
+        for job in jobs:
+            try:
+                decoded.put((job, _decode_image(job[0])))
+            except Exception as e:
+                _print_error(job[0], e)
+                decoded.put((job, None))
+        decoded.put(None)
+
+    def encode_stage():
+        while True:
+            item = matched.get()
+            if item is None:
+                break
+            job, state = item
+            if state is None:
+                results.append(False)
+                continue
+
+            input_path, output_path, _, _, compress_level, quiet, _ = job
+            img, data, alpha, bg_colors, pixel_counts = state
+            try:
+                _encode_image(img, data, alpha, output_path, compress_level)
+                if not quiet:
+                    _print_result(input_path, output_path, bg_colors, pixel_counts)
+                results.append(True)
+            except Exception as e:
+                _print_error(input_path, e)
+                results.append(False)
+
+    decoder = threading.Thread(target=decode_stage)
+    encoder = threading.Thread(target=encode_stage)
+    decoder.start()
+    encoder.start()
+
+    while True:
+        item = decoded.get()
+        if item is None:
+            break
+        job, state = item
+        if state is not None:
+            input_path, _, bg_colors, tolerance, _, quiet, color_labels = job
+            try:
+                img, data, rgb, alpha = state
+                bg_colors, bg_arr = _resolve_colors(bg_colors, color_labels)
+                pixel_counts = _match_background(rgb, alpha, bg_arr, tolerance, count=not quiet)
+                state = (img, data, alpha, bg_colors, pixel_counts)
+            except Exception as e:
+                _print_error(input_path, e)
+                state = None
+        matched.put((job, state))
+
+    matched.put(None)
+    decoder.join()
+    encoder.join()
+
+    return results
+
+
+def process_directory(input_dir, output_dir, bg_colors='#8DC5FE', tolerance=30, compress_level=1,
+                      batch_mode='processes', quiet=None):
     """
     Process all images in a directory.
 
@@ -146,6 +407,11 @@ def process_directory(input_dir, output_dir, bg_colors='#8DC5FE', tolerance=30):
         output_dir (str): Output directory path
         bg_colors (str or list): Background color(s) to remove
         tolerance (int): Color matching tolerance
+        compress_level (int): PNG zlib compression level (0-9)
+        batch_mode (str): 'processes' to spread images across CPU cores, or 'pipeline'
+            to overlap decoding, matching and encoding on threads in one process
+        quiet (bool): Skip per-image pixel counts and summaries. None enables it
+            automatically for batches of more than QUIET_BATCH_SIZE images
 
     Returns:
         tuple: (success_count, total_count)
@@ -174,17 +440,43 @@ def process_directory(input_dir, output_dir, bg_colors='#8DC5FE', tolerance=30):
     else:
         print(f"Background colors: {', '.join(color_list)}")
     print(f"Tolerance: {tolerance}")
+    if quiet is None:
+        quiet = len(image_files) > QUIET_BATCH_SIZE
+    if quiet:
+        print("Per-image output suppressed (errors are still reported)")
     print("-" * 60)
 
-    success_count = 0
+    # Resolve the hex colors once for the whole batch
+    try:
+        color_list, bg_arr = _resolve_colors(color_list)
+    except ValueError as e:
+        print(f"Error: Invalid background color: {e}", file=sys.stderr)
+        return 0, len(image_files)
+
+    # Create the output directory once for the whole batch
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # Create output filenames (always .png)
+    jobs = [
+        (str(img_file), str(Path(output_dir) / (img_file.stem + '_transparent.png')),
+         bg_arr, tolerance, compress_level, quiet, color_list)
+        for img_file in image_files
+    ]
 
-    for img_file in image_files:
-        # Create output filename (always .png)
-        output_filename = img_file.stem + '_transparent.png'
-        output_path = Path(output_dir) / output_filename
+    if len(jobs) > 1 and batch_mode == 'pipeline':
+        results = _run_pipeline(jobs)
+    elif len(jobs) > 1:
+        # Images are independent, so spread them across CPU cores. Workers are
+        # spawned rather than forked: forking after this process has used the
+        # Numba thread pool (e.g. an earlier pipeline run) can deadlock.
+        spawn_context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=spawn_context,
+                                 initializer=_init_worker) as executor:
+            results = list(executor.map(_process_file, jobs))
+    else:
+        results = [_process_file(job) for job in jobs]
 
-        if remove_background(str(img_file), str(output_path), bg_colors, tolerance):
-            success_count += 1
+    success_count = sum(results)
 
     print("-" * 60)
     print(f"\nCompleted: {success_count}/{len(image_files)} images processed successfully")
@@ -239,6 +531,13 @@ Examples:
     parser.add_argument('-t', '--tolerance', type=int,
                         help='Color matching tolerance 0-255')
 
+    # Per-image output (default: automatic, quiet for large directory batches)
+    verbosity_group = parser.add_mutually_exclusive_group()
+    verbosity_group.add_argument('-q', '--quiet', action='store_const', const=True, dest='quiet',
+                                 help='Skip per-image pixel counts and summaries')
+    verbosity_group.add_argument('-v', '--verbose', action='store_const', const=False, dest='quiet',
+                                 help='Always print per-image pixel counts and summaries')
+
     args = parser.parse_args()
 
     # Load config file
@@ -259,6 +558,9 @@ Examples:
             print("Error: --output is required for single file mode", file=sys.stderr)
             sys.exit(1)
 
+    compress_level = config.get('png_compress_level', 1)
+    batch_mode = config.get('batch_mode', 'processes')
+
     # Validate tolerance
     if not 0 <= args.tolerance <= 255:
         print("Error: Tolerance must be between 0 and 255", file=sys.stderr)
@@ -274,7 +576,11 @@ Examples:
             print(f"Error: Input file not found: {args.input}", file=sys.stderr)
             sys.exit(1)
 
-        success = remove_background(args.input, args.output, bg_colors, args.tolerance)
+        # Ensure output directory exists
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+
+        success = remove_background(args.input, args.output, bg_colors, args.tolerance, compress_level,
+                                    bool(args.quiet))
         sys.exit(0 if success else 1)
 
     else:
@@ -284,7 +590,8 @@ Examples:
             sys.exit(1)
 
         success_count, total_count = process_directory(
-            args.directory, args.output, bg_colors, args.tolerance
+            args.directory, args.output, bg_colors, args.tolerance, compress_level, batch_mode,
+            args.quiet
         )
 
         sys.exit(0 if success_count == total_count else 1)
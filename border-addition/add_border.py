@@ -8,10 +8,17 @@ import os
 import sys
 import argparse
 import json
+import functools
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image
 import numpy as np
-from scipy.ndimage import binary_dilation
+from scipy.ndimage import binary_dilation, distance_transform_edt
+
+# Directory batches larger than this skip per-image output unless told otherwise
+QUIET_BATCH_SIZE = 100
 
 
 def load_config(config_path='config.json'):
@@ -47,95 +54,230 @@ def load_config(config_path='config.json'):
         return {}
 
 
+@functools.lru_cache(maxsize=None)
 def hex_to_rgb(hex_color):
     """Convert hex color code to RGB tuple."""
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
-def add_border_to_subject(input_path, output_path, border_color='#FF0000', border_width=2):
+def _disk_structure(radius):
+    """Build a boolean disk structuring element of the given radius."""
+    yy, xx = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+    return (xx * xx + yy * yy) <= radius * radius
+
+
+def _decode_image(input_path):
     """
-    Add border around the subject silhouette (following the contour) in transparent PNG.
+    Load an image as RGBA together with a writable pixel array.
 
     Args:
-        input_path (str): Path to input PNG file (with transparency)
-        output_path (str): Path to output PNG file
-        border_color (str): Border color in hex format (e.g., '#FF0000' for red)
-        border_width (int): Border width in pixels
+        input_path (str): Path to input PNG file
 
     Returns:
-        bool: True if successful, False otherwise
+        tuple: (img, data) where data is the (H, W, 4) uint8 array the border is drawn into
     """
-    try:
-        # Load image
-        img = Image.open(input_path)
+    # Load image
+    img = Image.open(input_path)
+
+    # Ensure RGBA mode
+    if img.mode != 'RGBA':
+        print(f"⚠ Warning: {input_path} is not in RGBA mode. Converting...")
+        img = img.convert('RGBA')
 
-        # Ensure RGBA mode
-        if img.mode != 'RGBA':
-            print(f"⚠ Warning: {input_path} is not in RGBA mode. Converting...")
-            img = img.convert('RGBA')
+    # Convert to numpy array (a writable copy, so the border is drawn in place)
+    return img, np.array(img)
 
-        # Convert to numpy array
-        data = np.array(img)
 
-        # Get alpha channel
-        alpha = data[:, :, 3]
+def _draw_border(data, border_color, border_width):
+    """
+    Draw the border into data around its non-transparent pixels.
+
+    Returns:
+        np.ndarray or None: Boolean border mask, or None if the image has no subject
+    """
+    # Get alpha channel
+    alpha = data[:, :, 3]
 
-        # Create binary mask of non-transparent pixels (subject)
-        subject_mask = alpha > 0
+    # Create binary mask of non-transparent pixels (subject)
+    subject_mask = alpha > 0
 
-        if not subject_mask.any():
-            print(f"⚠ Warning: No non-transparent pixels found in {input_path}")
-            # Still save the image (no border added)
-            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
-            img.save(output_path, 'PNG')
-            return True
+    if not subject_mask.any():
+        return None
 
+    if border_width <= 3:
         # Dilate the subject mask to expand it by border_width pixels
         # Use a circular structuring element for smooth borders
-        structure = np.ones((3, 3), dtype=bool)
-        dilated_mask = subject_mask.copy()
-        for _ in range(border_width):
-            dilated_mask = binary_dilation(dilated_mask, structure=structure)
+        structure = _disk_structure(border_width)
+        dilated_mask = binary_dilation(subject_mask, structure=structure)
 
         # Border pixels are: dilated - original
         border_mask = dilated_mask & ~subject_mask
+    else:
+        # Dilation cost grows with the disk area, so for wide borders use
+        # the distance to the nearest subject pixel (one pass, any width)
+        dist = distance_transform_edt(~subject_mask)
+        border_mask = (dist > 0) & (dist <= border_width)
 
-        # Create output image starting from input
-        result_data = data.copy()
-
+    if border_mask.any():
         # Convert border color to RGBA
         border_rgb = hex_to_rgb(border_color)
         border_rgba = border_rgb + (255,)
 
-        # Apply border color to border pixels
-        result_data[border_mask] = border_rgba
+        # Apply border color to border pixels, viewing the image as a flat
+        # (pixels, 4) array so each match is one contiguous 4-byte store
+        flat_pixels = data.reshape(-1, 4)
+        flat_pixels[border_mask.ravel()] = np.array(border_rgba, dtype=np.uint8)
 
-        # Convert back to PIL Image
-        result = Image.fromarray(result_data, 'RGBA')
+    return border_mask
 
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
 
-        # Save as PNG
-        result.save(output_path, 'PNG')
+def _encode_image(img, data, border_mask, output_path, compress_level):
+    """Save the bordered image (or the input as is when nothing was drawn) as PNG."""
+    if border_mask is not None and border_mask.any():
+        # Wrap the array back into a PIL Image without another copy
+        result = Image.frombuffer('RGBA', img.size, data, 'raw', 'RGBA', 0, 1)
+    else:
+        # Nothing to draw (no subject, or subject fills the frame), save the input as is
+        result = img
+
+    # Save as PNG
+    result.save(output_path, 'PNG', compress_level=compress_level, optimize=False)
+
 
-        border_pixel_count = np.sum(border_mask)
-        print(f"✓ Successfully processed: {input_path}")
-        print(f"  → Border: {border_color} ({border_width}px) around subject silhouette")
-        print(f"  → Border pixels added: {border_pixel_count}")
-        print(f"  → Saved to: {output_path}")
+def _print_result(input_path, output_path, border_color, border_width, border_mask, quiet=False):
+    """Print the per-image summary (only the empty-subject warning when quiet)."""
+    if border_mask is None:
+        print(f"⚠ Warning: No non-transparent pixels found in {input_path}")
+        return
+    if quiet:
+        # Skip the full-image scan that only feeds the pixel count
+        return
 
+    border_pixel_count = np.count_nonzero(border_mask)
+    print(f"✓ Successfully processed: {input_path}")
+    print(f"  → Border: {border_color} ({border_width}px) around subject silhouette")
+    print(f"  → Border pixels added: {border_pixel_count}")
+    print(f"  → Saved to: {output_path}")
+
+
+def _print_error(input_path, error):
+    """Print a per-image failure with its traceback."""
+    print(f"✗ Error processing {input_path}: {str(error)}", file=sys.stderr)
+    import traceback
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+def add_border_to_subject(input_path, output_path, border_color='#FF0000', border_width=2, compress_level=1,
+                          quiet=False):
+    """
+    Add border around the subject silhouette (following the contour) in transparent PNG.
+
+    Args:
+        input_path (str): Path to input PNG file (with transparency)
+        output_path (str): Path to output PNG file (its directory must already exist)
+        border_color (str): Border color in hex format (e.g., '#FF0000' for red)
+        border_width (int): Border width in pixels
+        compress_level (int): PNG zlib compression level (0-9). Lower is faster, larger files.
+        quiet (bool): Skip the border pixel count and per-image summary (warnings and errors are still reported)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        img, data = _decode_image(input_path)
+        border_mask = _draw_border(data, border_color, border_width)
+        _encode_image(img, data, border_mask, output_path, compress_level)
+        _print_result(input_path, output_path, border_color, border_width, border_mask, quiet)
         return True
 
     except Exception as e:
-        print(f"✗ Error processing {input_path}: {str(e)}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        _print_error(input_path, e)
         return False
 
 
-def process_directory(input_dir, output_dir, border_color='#FF0000', border_width=2):
+def _process_file(args):
+    """Run add_border_to_subject on one (input, output, color, width, compress_level, quiet) tuple in a worker process."""
+    return add_border_to_subject(*args)
+
+
+def _run_pipeline(jobs, queue_depth=4):
+    """
+    Run jobs through three overlapping stages in one process: a decoder thread,
+    border drawing on the calling thread, and an encoder thread.
+
+    Pillow releases the GIL while decoding and encoding, so file I/O and
+    compression overlap with the morphology of neighbouring images.
+
+    Args:
+        jobs (list): (input, output, color, width, compress_level, quiet) tuples
+        queue_depth (int): Maximum images buffered between stages
+
+    Returns:
+        list: Success flag per job
+    """
+    decoded = queue.Queue(maxsize=queue_depth)
+    drawn = queue.Queue(maxsize=queue_depth)
+    results = []
+
+    def decode_stage():
+        for job in jobs:
+            try:
+                decoded.put((job, _decode_image(job[0])))
+            except Exception as e:
+                _print_error(job[0], e)
+                decoded.put((job, None))
+        decoded.put(None)
+
+    def encode_stage():
+        while True:
+            item = drawn.get()
+            if item is None:
+                break
+            job, state = item
+            if state is None:
+                results.append(False)
+                continue
+
+            input_path, output_path, border_color, border_width, compress_level, quiet = job
+            img, data, border_mask = state
+            try:
+                _encode_image(img, data, border_mask, output_path, compress_level)
+                _print_result(input_path, output_path, border_color, border_width, border_mask, quiet)
+                results.append(True)
+            except Exception as e:
+                _print_error(input_path, e)
+                results.append(False)
+
+    decoder = threading.Thread(target=decode_stage)
+    encoder = threading.Thread(target=encode_stage)
+    decoder.start()
+    encoder.start()
+
+    while True:
+        item = decoded.get()
+        if item is None:
+            break
+        job, state = item
+        if state is not None:
+            input_path, _, border_color, border_width, _, _ = job
+            try:
+                img, data = state
+                state = (img, data, _draw_border(data, border_color, border_width))
+            except Exception as e:
+                _print_error(input_path, e)
+                state = None
+        drawn.put((job, state))
+
+    drawn.put(None)
+    decoder.join()
+    encoder.join()
+
+    return results
+
+
+def process_directory(input_dir, output_dir, border_color='#FF0000', border_width=2, compress_level=1,
+                      batch_mode='processes', quiet=None):
     """
     Process all PNG images in a directory.
 
@@ -144,6 +286,11 @@ def process_directory(input_dir, output_dir, border_color='#FF0000', border_widt
         output_dir (str): Output directory path
         border_color (str): Border color in hex format
         border_width (int): Border width in pixels
+        compress_level (int): PNG zlib compression level (0-9)
+        batch_mode (str): 'processes' to spread images across CPU cores, or 'pipeline'
+            to overlap decoding, drawing and encoding on threads in one process
+        quiet (bool): Skip per-image pixel counts and summaries. None enables it
+            automatically for batches of more than QUIET_BATCH_SIZE images
 
     Returns:
         tuple: (success_count, total_count)
@@ -160,17 +307,32 @@ def process_directory(input_dir, output_dir, border_color='#FF0000', border_widt
     print(f"\nProcessing {len(png_files)} PNG images from {input_dir}...")
     print(f"Border color: {border_color}")
     print(f"Border width: {border_width}px")
+    if quiet is None:
+        quiet = len(png_files) > QUIET_BATCH_SIZE
+    if quiet:
+        print("Per-image output suppressed (errors are still reported)")
     print("-" * 60)
 
-    success_count = 0
-
-    for img_file in png_files:
-        # Create output filename
-        output_filename = img_file.stem + '_bordered.png'
-        output_path = Path(output_dir) / output_filename
+    # Create the output directory once for the whole batch
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # Create output filenames
+    jobs = [
+        (str(img_file), str(Path(output_dir) / (img_file.stem + '_bordered.png')),
+         border_color, border_width, compress_level, quiet)
+        for img_file in png_files
+    ]
+
+    if len(jobs) > 1 and batch_mode == 'pipeline':
+        results = _run_pipeline(jobs)
+    elif len(jobs) > 1:
+        # Images are independent, so spread them across CPU cores
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(_process_file, jobs))
+    else:
+        results = [_process_file(job) for job in jobs]
 
-        if add_border_to_subject(str(img_file), str(output_path), border_color, border_width):
-            success_count += 1
+    success_count = sum(results)
 
     print("-" * 60)
     print(f"\nCompleted: {success_count}/{len(png_files)} images processed successfully")
@@ -222,6 +384,13 @@ Examples:
     parser.add_argument('-w', '--width', type=int,
                         help='Border width in pixels (1-100)')
 
+    # Per-image output (default: automatic, quiet for large directory batches)
+    verbosity_group = parser.add_mutually_exclusive_group()
+    verbosity_group.add_argument('-q', '--quiet', action='store_const', const=True, dest='quiet',
+                                 help='Skip per-image pixel counts and summaries')
+    verbosity_group.add_argument('-v', '--verbose', action='store_const', const=False, dest='quiet',
+                                 help='Always print per-image pixel counts and summaries')
+
     args = parser.parse_args()
 
     # Load config file
@@ -242,6 +411,9 @@ Examples:
             print("Error: --output is required for single file mode", file=sys.stderr)
             sys.exit(1)
 
+    compress_level = config.get('png_compress_level', 1)
+    batch_mode = config.get('batch_mode', 'processes')
+
     # Validate border width
     if args.width < 1 or args.width > 100:
         print("Error: Border width must be between 1 and 100 pixels", file=sys.stderr)
@@ -254,7 +426,11 @@ Examples:
             print(f"Error: Input file not found: {args.input}", file=sys.stderr)
             sys.exit(1)
 
-        success = add_border_to_subject(args.input, args.output, args.color, args.width)
+        # Ensure output directory exists
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+
+        success = add_border_to_subject(args.input, args.output, args.color, args.width, compress_level,
+                                        bool(args.quiet))
         sys.exit(0 if success else 1)
 
     else:
@@ -264,7 +440,8 @@ Examples:
             sys.exit(1)
 
         success_count, total_count = process_directory(
-            args.directory, args.output, args.color, args.width
+            args.directory, args.output, args.color, args.width, compress_level, batch_mode,
+            args.quiet
         )
 
         sys.exit(0 if success_count == total_count else 1)
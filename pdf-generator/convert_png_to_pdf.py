@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Dict, Optional
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor
+from reportlab.lib.utils import ImageReader
 from PIL import Image
 
 
@@ -36,24 +37,93 @@ class PNGtoPDFConverter:
             print(f"Error: Invalid JSON in configuration file: {e}")
             sys.exit(1)
 
-    def _validate_image(self, image_path: str) -> bool:
-        """Validate that image exists and is readable."""
+    def _load_image(self, image_path: str) -> Optional[Image.Image]:
+        """Decode image once so it can be validated, measured and drawn. Returns None if unreadable."""
         if not os.path.exists(image_path):
             print(f"Error: Image not found: {image_path}")
-            return False
+            return None
 
         try:
             with Image.open(image_path) as img:
-                img.verify()
-            return True
+                img.load()
+            return img
         except Exception as e:
             print(f"Error: Invalid image file {image_path}: {e}")
-            return False
+            return None
+
+    def _draw_page(self, c: canvas.Canvas, img: Image.Image, png_path: Path) -> None:
+        """Draw the background and the fitted image onto the current page of the canvas."""
+        cfg = self.config
+
+        # Page dimensions
+        page_width = cfg['page_width_pt']
+        page_height = cfg['page_height_pt']
+
+        # Padding
+        top_pad = cfg.get('top_padding_pt', 0)
+        bottom_pad = cfg.get('bottom_padding_pt', 0)
+        left_pad = cfg.get('left_padding_pt', 0)
+        right_pad = cfg.get('right_padding_pt', 0)
+
+        # Available space for image
+        available_width = page_width - left_pad - right_pad
+        available_height = page_height - top_pad - bottom_pad
+
+        print(f"  Page: {page_width}pt × {page_height}pt")
+        print(f"  Padding: T:{top_pad}pt B:{bottom_pad}pt L:{left_pad}pt R:{right_pad}pt")
+        print(f"  Available: {available_width}pt × {available_height}pt")
 
-    def _get_image_dimensions(self, image_path: str) -> tuple:
-        """Get image dimensions."""
-        with Image.open(image_path) as img:
-            return img.size
+        # Get image dimensions
+        img_width_px, img_height_px = img.size
+
+        # Calculate scaling to fit image in available space
+        # Assuming 72 DPI for conversion (standard PDF points)
+        # But if the PNG is high-res (e.g., 4x scale = 288 DPI), we need to account for that
+        # For now, let's calculate based on maintaining aspect ratio to fit available space
+
+        if cfg.get('fit_to_page', True):
+            # Scale to fit within available space while maintaining aspect ratio
+            scale_w = available_width / img_width_px
+            scale_h = available_height / img_height_px
+            scale = min(scale_w, scale_h)
+
+            img_width_pt = img_width_px * scale
+            img_height_pt = img_height_px * scale
+        else:
+            # Use image at its native size (assuming pixels = points)
+            img_width_pt = min(img_width_px, available_width)
+            img_height_pt = min(img_height_px, available_height)
+
+        # Calculate position
+        if cfg.get('center_image', True):
+            # Center the image in available space
+            x = left_pad + (available_width - img_width_pt) / 2
+            y = bottom_pad + (available_height - img_height_pt) / 2
+        else:
+            # Align to bottom-left of available space
+            x = left_pad
+            y = bottom_pad
+
+        print(f"  Image: {img_width_pt:.1f}pt × {img_height_pt:.1f}pt at ({x:.1f}, {y:.1f})")
+
+        # Fill background if color is specified
+        bg_color = cfg.get('background_color', '')
+        if bg_color and bg_color.strip():
+            c.setFillColor(HexColor(bg_color))
+            c.rect(0, 0, page_width, page_height, fill=1, stroke=0)
+            print(f"  Background: {bg_color}")
+
+        # Draw the PNG image from the already decoded pixels
+        # (JPEG files go by path so ReportLab embeds them without re-encoding)
+        image_source = str(png_path) if img.format == 'JPEG' else ImageReader(img)
+        c.drawImage(
+            image_source,
+            x, y,
+            width=img_width_pt,
+            height=img_height_pt,
+            preserveAspectRatio=True,
+            mask='auto'
+        )
 
     def convert_png_to_pdf(self, png_path: str, output_path: Optional[str] = None) -> bool:
         """
@@ -68,8 +138,9 @@ class PNGtoPDFConverter:
         """
         png_path = Path(png_path)
 
-        # Validate input
-        if not self._validate_image(str(png_path)):
+        # Validate input (decoding it once for all later steps)
+        img = self._load_image(str(png_path))
+        if img is None:
             return False
 
         # Determine output path
@@ -82,82 +153,14 @@ class PNGtoPDFConverter:
         else:
             output_path = Path(output_path)
 
-        cfg = self.config
-
         print(f"Converting: {png_path.name}")
         print(f"  Output: {output_path}")
 
         try:
-            # Page dimensions
-            page_width = cfg['page_width_pt']
-            page_height = cfg['page_height_pt']
-
-            # Padding
-            top_pad = cfg.get('top_padding_pt', 0)
-            bottom_pad = cfg.get('bottom_padding_pt', 0)
-            left_pad = cfg.get('left_padding_pt', 0)
-            right_pad = cfg.get('right_padding_pt', 0)
-
-            # Available space for image
-            available_width = page_width - left_pad - right_pad
-            available_height = page_height - top_pad - bottom_pad
-
-            print(f"  Page: {page_width}pt × {page_height}pt")
-            print(f"  Padding: T:{top_pad}pt B:{bottom_pad}pt L:{left_pad}pt R:{right_pad}pt")
-            print(f"  Available: {available_width}pt × {available_height}pt")
-
-            # Get image dimensions
-            img_width_px, img_height_px = self._get_image_dimensions(str(png_path))
-
-            # Calculate scaling to fit image in available space
-            # Assuming 72 DPI for conversion (standard PDF points)
-            # But if the PNG is high-res (e.g., 4x scale = 288 DPI), we need to account for that
-            # For now, let's calculate based on maintaining aspect ratio to fit available space
-
-            if cfg.get('fit_to_page', True):
-                # Scale to fit within available space while maintaining aspect ratio
-                scale_w = available_width / img_width_px
-                scale_h = available_height / img_height_px
-                scale = min(scale_w, scale_h)
-
-                img_width_pt = img_width_px * scale
-                img_height_pt = img_height_px * scale
-            else:
-                # Use image at its native size (assuming pixels = points)
-                img_width_pt = min(img_width_px, available_width)
-                img_height_pt = min(img_height_px, available_height)
-
-            # Calculate position
-            if cfg.get('center_image', True):
-                # Center the image in available space
-                x = left_pad + (available_width - img_width_pt) / 2
-                y = bottom_pad + (available_height - img_height_pt) / 2
-            else:
-                # Align to bottom-left of available space
-                x = left_pad
-                y = bottom_pad
-
-            print(f"  Image: {img_width_pt:.1f}pt × {img_height_pt:.1f}pt at ({x:.1f}, {y:.1f})")
-
             # Create PDF
-            c = canvas.Canvas(str(output_path), pagesize=(page_width, page_height))
-
-            # Fill background if color is specified
-            bg_color = cfg.get('background_color', '')
-            if bg_color and bg_color.strip():
-                c.setFillColor(HexColor(bg_color))
-                c.rect(0, 0, page_width, page_height, fill=1, stroke=0)
-                print(f"  Background: {bg_color}")
-
-            # Draw the PNG image
-            c.drawImage(
-                str(png_path),
-                x, y,
-                width=img_width_pt,
-                height=img_height_pt,
-                preserveAspectRatio=True,
-                mask='auto'
-            )
+            page_size = (self.config['page_width_pt'], self.config['page_height_pt'])
+            c = canvas.Canvas(str(output_path), pagesize=page_size)
+            self._draw_page(c, img, png_path)
 
             # Save PDF
             c.save()
@@ -210,6 +213,75 @@ class PNGtoPDFConverter:
         print(f"  Failed: {fail_count}")
         print("=" * 60)
 
+    def convert_directory_combined(self, directory_path: str, output_path: Optional[str] = None,
+                                   pattern: str = "*.png") -> None:
+        """
+        Convert all PNG files in a directory into a single multi-page PDF (one page per PNG).
+
+        Args:
+            directory_path: Path to directory containing PNG files
+            output_path: Optional output path for PDF. If not provided, will use the directory name
+            pattern: Glob pattern for matching files (default: "*.png")
+        """
+        dir_path = Path(directory_path)
+
+        if not dir_path.exists() or not dir_path.is_dir():
+            print(f"Error: Directory not found: {directory_path}")
+            return
+
+        png_files = sorted(dir_path.glob(pattern))
+
+        if not png_files:
+            print(f"No PNG files found in {directory_path}")
+            return
+
+        # Determine output path
+        if output_path is None:
+            output_suffix = self.config.get('output_suffix', '_pdf')
+            output_name = dir_path.resolve().name + output_suffix + '.pdf'
+            output_dir = self.base_dir / self.config.get('output_directory', 'output')
+            output_dir.mkdir(exist_ok=True)
+            output_path = output_dir / output_name
+        else:
+            output_path = Path(output_path)
+
+        print(f"Found {len(png_files)} PNG files to combine into {output_path}\n")
+        print("=" * 60)
+
+        success_count = 0
+        fail_count = 0
+
+        # One canvas for the whole batch, so the PDF writer setup and save happen once
+        page_size = (self.config['page_width_pt'], self.config['page_height_pt'])
+        c = canvas.Canvas(str(output_path), pagesize=page_size)
+
+        for png_file in png_files:
+            img = self._load_image(str(png_file))
+            if img is None:
+                fail_count += 1
+                continue
+
+            print(f"Adding page: {png_file.name}")
+            try:
+                self._draw_page(c, img, png_file)
+                c.showPage()
+                success_count += 1
+            except Exception as e:
+                print(f"  ✗ Error adding page: {e}\n")
+                fail_count += 1
+
+        if success_count:
+            c.save()
+            print(f"\n  ✓ Successfully created: {output_path}")
+
+        # Summary
+        print("=" * 60)
+        print(f"CONVERSION COMPLETE")
+        print(f"  Total: {len(png_files)}")
+        print(f"  Pages: {success_count}")
+        print(f"  Failed: {fail_count}")
+        print("=" * 60)
+
 
 def main():
     """Main entry point."""
@@ -227,6 +299,9 @@ Examples:
   # Convert all PNGs in a directory
   python convert_png_to_pdf.py -d output/
 
+  # Convert all PNGs in a directory into one multi-page PDF
+  python convert_png_to_pdf.py -d output/ --combined -o cards.pdf
+
   # Use custom config
   python convert_png_to_pdf.py image.png -c my_config.json
         """
@@ -250,6 +325,11 @@ Examples:
         default='png_to_pdf_config.json',
         help='Configuration file (default: png_to_pdf_config.json)'
     )
+    parser.add_argument(
+        '--combined',
+        action='store_true',
+        help='In directory mode, write one multi-page PDF instead of one PDF per PNG'
+    )
     parser.add_argument(
         '-p', '--pattern',
         default='*.png',
@@ -262,6 +342,8 @@ Examples:
     if not args.input and not args.directory:
         parser.print_help()
         sys.exit(1)
+    if args.combined and not args.directory:
+        parser.error('--combined requires -d/--directory')
 
     print("=" * 60)
     print("PNG TO PDF CONVERTER")
@@ -272,7 +354,9 @@ Examples:
     converter = PNGtoPDFConverter(args.config)
 
     # Convert
-    if args.directory:
+    if args.directory and args.combined:
+        converter.convert_directory_combined(args.directory, args.output, args.pattern)
+    elif args.directory:
         converter.convert_directory(args.directory, args.pattern)
     elif args.input:
         converter.convert_png_to_pdf(args.input, args.output)
@@ -5,14 +5,24 @@ Generates 3" x 7" portrait cards with person image, name, QR code, and message.
 """
 
 import os
+import io
+import re
 import sys
 import json
 import csv
+import argparse
+import bisect
+import functools
+import itertools
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+from reportlab import rl_config
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
+from reportlab.pdfgen.pathobject import PDFPathObject
 from reportlab.lib.utils import ImageReader
 from reportlab.lib.colors import HexColor
 from reportlab.pdfbase import pdfmetrics
@@ -20,17 +30,71 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.enums import TA_CENTER
 from reportlab.platypus import Paragraph
 from reportlab.lib.styles import ParagraphStyle
-from PIL import Image
+from PIL import Image, ImageChops
+
+
+# A name token: a run of characters up to the next space or comma, keeping a trailing comma
+_TOKEN_RE = re.compile(r'[^ ,]+,?')
+
+# Characters not allowed in output filenames (\w is exactly str.isalnum() plus '_')
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w -]')
+
+
+def _border_segments(x: float, y: float, width: float, height: float, sides: frozenset) -> List[tuple]:
+    """Line segments (x1, y1, x2, y2) for the given sides of a box."""
+    segments = []
+    if 'left' in sides:
+        segments.append((x, y, x, y + height))
+    if 'right' in sides:
+        segments.append((x + width, y, x + width, y + height))
+    if 'top' in sides:
+        segments.append((x, y + height, x + width, y + height))
+    if 'bottom' in sides:
+        segments.append((x, y, x + width, y))
+    return segments
+
+
+@functools.lru_cache(maxsize=1024)
+def _safe_filename(name: str) -> str:
+    """Convert name to safe filename (see CardGenerator._sanitize_filename)."""
+    # Replace unsafe characters, then spaces with underscores, and convert to lowercase
+    return _UNSAFE_FILENAME_RE.sub('_', name).strip().replace(' ', '_').lower()
+
+
+@functools.lru_cache(maxsize=4096)
+def _string_width(text: str, font: str, font_size: float) -> float:
+    """Width of text in points, memoized since names and sizes repeat across cards."""
+    return pdfmetrics.stringWidth(text, font, font_size)
 
 
 class CardGenerator:
     """Generates PDF cards from CSV input and configuration."""
     
-    def __init__(self, config_path: str = "config.json"):
-        """Initialize with configuration file."""
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path: str = "config.json", config: Optional[Dict] = None, verbose: bool = False):
+        """
+        Initialize with configuration file (or an already loaded configuration).
+        With verbose, per-card layout details are printed as well.
+        """
+        self.config = config if config is not None else self._load_config(config_path)
+        self.verbose = verbose
         self.base_dir = Path(__file__).parent
+        self._image_sizes: Dict[str, Tuple[int, int]] = {}
+        self._paragraph_cache: Dict[tuple, Tuple[Paragraph, float]] = {}
+        self._plan = self._build_plan()
+        self._qr_reader = self._load_qr_code()
         
+    def _apply_fast_pdf(self) -> None:
+        """
+        Set ReportLab's process-wide image stream encoding from fast_pdf. With it, streams are
+        written as binary instead of ASCII85 text, whose pure Python encoder dominates save time.
+        """
+        rl_config.useA85 = 0 if self.config.get('fast_pdf', True) else 1
+    
+    def _debug(self, message: str) -> None:
+        """Print per-card detail output, only in verbose mode."""
+        if self.verbose:
+            print(message)
+    
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file."""
         try:
@@ -43,65 +107,297 @@ class CardGenerator:
             print(f"Error: Invalid JSON in configuration file: {e}")
             sys.exit(1)
     
-    def _validate_image(self, image_path: str) -> bool:
-        """Validate that image exists and is readable."""
-        if not os.path.exists(image_path):
-            print(f"Warning: Image not found: {image_path}")
-            return False
+    def _build_plan(self) -> SimpleNamespace:
+        """
+        Precompute everything in the card layout that depends only on the configuration:
+        typed dimensions, border sides, colors and the Y positions for short and long names.
+        """
+        cfg = self.config
+        try:
+            # Page dimensions in points
+            page_width = cfg['page_width_pt']
+            page_height = cfg['page_height_pt']
+            
+            # Layout parameters
+            h_padding = cfg['horizontal_padding_pt']
+            top_padding = cfg.get('top_padding_pt', 0)
+            bottom_padding = cfg.get('bottom_padding_pt', 0)
+            top_margin = cfg['top_margin_pt']
+            content_width = page_width - (2 * h_padding)
+            
+            # Section heights
+            photo_height = cfg['photo_section_height_pt']
+            qr_height = cfg['qr_section_height_pt']
+            gap_before_msg = cfg['gap_before_message_pt']
+            message_height = cfg['message_box_height_pt']
+            bottom_box_height = cfg.get('bottom_box_height_pt', 0)
+            
+            # Name box and bottom box are inset by their horizontal margins
+            name_h_margin = cfg.get('name_box_horizontal_margin_pt', 0)
+            bottom_h_margin = cfg.get('bottom_box_horizontal_margin_pt', 0)
+            name_box_x = h_padding + name_h_margin
+            name_box_width = content_width - (2 * name_h_margin)
+            bottom_box_x = h_padding + bottom_h_margin
+            bottom_box_width = content_width - (2 * bottom_h_margin)
+            
+            # Borders, grouped by (color, width) so each group is stroked as one path
+            border_styles = {
+                'name': ('name_box_border_sides', 'name_box_border_width_pt', 'name_box_border_color'),
+                'qr': ('qr_section_border_sides', 'qr_section_border_width_pt', 'qr_section_border_color'),
+                'message': ('message_box_border_sides', 'message_box_border_width_pt', 'message_box_border_color'),
+            }
+            border_styles = {
+                section: (frozenset(cfg.get(sides_key, [])), cfg.get(width_key, 2), cfg.get(color_key, '#000000'))
+                for section, (sides_key, width_key, color_key) in border_styles.items()
+            }
+            
+            def layout(name_height: float, name_font_size: float, name_multiline: bool) -> SimpleNamespace:
+                # Calculate Y positions from TOP (convert to bottom-up for ReportLab)
+                # Top positions (from top edge, accounting for top padding)
+                y_top_photo = top_padding + top_margin
+                y_top_name = y_top_photo + photo_height
+                y_top_qr = y_top_name + name_height
+                y_top_message = y_top_qr + qr_height + gap_before_msg
+                y_top_bottom_box = y_top_message + message_height
+                
+                # Convert to ReportLab coordinates (from bottom, accounting for bottom padding)
+                # ReportLab uses bottom-up coordinates, so bottom_padding lifts everything up
+                y_photo = page_height - y_top_photo - photo_height - bottom_padding
+                y_name = page_height - y_top_name - name_height - bottom_padding
+                y_qr = page_height - y_top_qr - qr_height - bottom_padding
+                y_message = page_height - y_top_message - message_height - bottom_padding
+                y_bottom_box = page_height - y_top_bottom_box - bottom_box_height - bottom_padding
+                
+                # Every bordered white box background in a single path, filled once
+                white_boxes = PDFPathObject()
+                white_boxes.rect(name_box_x, y_name, name_box_width, name_height)
+                white_boxes.rect(h_padding, y_qr, content_width, qr_height)
+                white_boxes.rect(h_padding, y_message, content_width, message_height)
+                
+                # Border segments of each box, one path per (color, width)
+                box_sides = {
+                    'name': (name_box_x, y_name, name_box_width, name_height),
+                    'qr': (h_padding, y_qr, content_width, qr_height),
+                    'message': (h_padding, y_message, content_width, message_height),
+                }
+                border_groups = {}
+                for section, (sides, line_width, color) in border_styles.items():
+                    segments = _border_segments(*box_sides[section], sides)
+                    if segments:
+                        border_groups.setdefault((color, line_width), []).extend(segments)
+                border_paths = []
+                for (color, line_width), segments in border_groups.items():
+                    path = PDFPathObject()
+                    for x1, y1, x2, y2 in segments:
+                        path.moveTo(x1, y1)
+                        path.lineTo(x2, y2)
+                    border_paths.append((HexColor(color), line_width, path))
+                
+                return SimpleNamespace(
+                    name_height=name_height,
+                    name_font_size=name_font_size,
+                    name_multiline=name_multiline,
+                    y_photo=y_photo,
+                    y_name=y_name,
+                    y_qr=y_qr,
+                    y_message=y_message,
+                    y_bottom_box=y_bottom_box,
+                    white_boxes=white_boxes,
+                    border_paths=border_paths,
+                )
+            
+            qr_size = cfg['qr_code_size_pt']
+            
+            return SimpleNamespace(
+                page_width=page_width,
+                page_height=page_height,
+                h_padding=h_padding,
+                top_padding=top_padding,
+                bottom_padding=bottom_padding,
+                text_padding=cfg.get('text_horizontal_padding_pt', 10),
+                content_width=content_width,
+                content_height=page_height - top_padding - bottom_padding,
+                photo_height=photo_height,
+                qr_height=qr_height,
+                message_height=message_height,
+                name_length_threshold=cfg.get('name_length_threshold', 22),
+                name_max_lines=cfg.get('name_max_lines', 2),
+                layout_short=layout(cfg['name_box_height_pt_short'], cfg['name_font_size_pt_short'], False),
+                layout_long=layout(cfg['name_box_height_pt_long'], cfg['name_font_size_pt_long'], True),
+                name_box_x=name_box_x,
+                name_box_width=name_box_width,
+                bottom_box_x=bottom_box_x,
+                bottom_box_width=bottom_box_width,
+                bottom_box_height=bottom_box_height,
+                qr_size=qr_size,
+                qr_x=h_padding + (content_width - qr_size) / 2,
+                message_text=cfg['message_text'],
+                message_font_size=cfg['message_font_size_pt'],
+                background_color=HexColor(cfg['background_color']),
+                white=HexColor('#FFFFFF'),
+                black=HexColor('#000000'),
+            )
+        except KeyError as e:
+            print(f"Error: Missing configuration key: {e}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Error: Invalid color in configuration: {e}")
+            sys.exit(1)
+    
+    def _probe_image(self, image_path: str) -> Optional[Tuple[int, int]]:
+        """
+        Check that an image exists and is readable, returning its size.
+        Only the header is parsed (no verify() pass), and results are cached per path.
+        """
+        key = str(image_path)
+        size = self._image_sizes.get(key)
+        if size is not None:
+            return size
+        
+        if not os.path.exists(key):
+            print(f"Warning: Image not found: {key}")
+            return None
         
         try:
-            with Image.open(image_path) as img:
-                img.verify()
-            return True
+            with Image.open(key) as img:
+                size = self._image_sizes[key] = img.size
+            return size
         except Exception as e:
-            print(f"Warning: Invalid image file {image_path}: {e}")
-            return False
+            print(f"Warning: Invalid image file {key}: {e}")
+            return None
     
-    def _get_image_dimensions(self, image_path: str) -> tuple:
-        """Get image dimensions."""
-        with Image.open(image_path) as img:
-            return img.size
+    def _load_qr_code(self) -> ImageReader:
+        """
+        Validate the QR code once and re-encode it at its printed size at image_dpi, in grayscale
+        unless it has colour, as the ImageReader every card draws from. The reader keeps its
+        decoded pixels, so the QR code is decoded once per generator and each card only hashes
+        and embeds a small bitmap.
+        """
+        qr_code_path = self.base_dir / self.config['qr_code_path']
+        if self._probe_image(qr_code_path) is None:
+            print(f"Error: QR code not found: {qr_code_path}")
+            sys.exit(1)
+        
+        dpi = self.config.get('image_dpi', 300)
+        target = max(1, round(self._plan.qr_size * dpi / 72))
+        with Image.open(qr_code_path) as img:
+            is_jpeg = img.format == 'JPEG'
+            
+            # drawImage is called without a mask, so transparency is dropped as ReportLab would
+            if img.mode in ('1', 'L', 'LA'):
+                img = img.convert('L')
+            else:
+                img = img.convert('RGB')
+                red, green, blue = img.split()
+                if (ImageChops.difference(red, green).getbbox() is None
+                        and ImageChops.difference(green, blue).getbbox() is None):
+                    img = red
+            
+            # Only ever shrinks, never upscales
+            img.thumbnail((target, target), Image.LANCZOS)
+        
+        # JPEG bytes are embedded as they are; PNG pixels are Flate-compressed per card
+        buffer = io.BytesIO()
+        if is_jpeg:
+            img.save(buffer, 'JPEG', quality=95)
+        else:
+            img.save(buffer, 'PNG', compress_level=1)
+        buffer.seek(0)
+        return ImageReader(buffer)
     
-    def _read_csv_data(self) -> List[Dict]:
-        """Read person data from CSV file."""
+    def _get_csv_path(self) -> Path:
+        """Resolve the input CSV path, exiting if it does not exist."""
         csv_path = self.base_dir / self.config['input_csv']
         
         if not csv_path.exists():
             print(f"Error: CSV file not found: {csv_path}")
             sys.exit(1)
         
-        data = []
+        return csv_path
+    
+    def _count_csv_rows(self, csv_path: Path) -> int:
+        """Count data rows without keeping them, skipping blank lines like DictReader."""
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            return max(0, sum(1 for row in csv.reader(f) if row) - 1)
+    
+    def _read_csv_data(self, csv_path: Path) -> Iterator[Tuple[str, str]]:
+        """
+        Stream (name, image) pairs from CSV file one row at a time.
+        Columns are looked up by header position once; blank lines are skipped and
+        missing columns or fields read as empty strings, as with DictReader.
+        """
         with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            
+            # Positions past the end of any row stand in for missing columns
+            name_idx = header.index('name') if 'name' in header else len(header)
+            image_idx = header.index('image') if 'image' in header else len(header)
+            
             for row in reader:
-                data.append(row)
-        
-        return data
+                if not row:
+                    continue
+                person_name = row[name_idx].strip() if name_idx < len(row) else ''
+                person_image = row[image_idx].strip() if image_idx < len(row) else ''
+                yield person_name, person_image
     
     def _draw_centered_image(self, c, image_path: str, x: float, y: float, 
                             width: float, height: float, max_width: float, max_height: float):
         """Draw an image centered horizontally, filling the height, maintaining aspect ratio."""
-        img_width, img_height = self._get_image_dimensions(image_path)
-        
-        # Scale to fill the height completely
-        scale_h = max_height / img_height
-        scale_w = max_width / img_width
+        # Open once; the decoded image is measured here and resampled for drawing below,
+        # and the file is closed once drawImage has embedded it
+        with Image.open(image_path) as img:
+            img_width, img_height = img.size
+            
+            # Scale to fill the height completely
+            scale_h = max_height / img_height
+            scale_w = max_width / img_width
+            
+            # Use the larger scale to ensure the image fills the section
+            # (may crop horizontally if image is wider than section)
+            scale = max(scale_w, scale_h)
+            
+            # Calculate final dimensions
+            final_width = img_width * scale
+            final_height = img_height * scale
+            
+            # Center horizontally only, align to bottom vertically
+            x_offset = x + (width - final_width) / 2
+            y_offset = y  # Align to bottom of section (no vertical centering)
+            
+            reader = self._downscaled_reader(img, final_width, final_height)
+            # The box already has the image's aspect ratio, so ReportLab need not refit it
+            c.drawImage(reader, x_offset, y_offset, 
+                       width=final_width, height=final_height, mask='auto')
+    
+    def _downscaled_reader(self, img: Image.Image, width_pt: float, height_pt: float) -> ImageReader:
+        """
+        Resample an image to its printed size at image_dpi and wrap it for drawImage.
+        Without this ReportLab embeds (and viewers decode) every source pixel.
+        """
+        dpi = self.config.get('image_dpi', 300)
+        target_size = (max(1, round(width_pt * dpi / 72)), max(1, round(height_pt * dpi / 72)))
         
-        # Use the larger scale to ensure the image fills the section
-        # (may crop horizontally if image is wider than section)
-        scale = max(scale_w, scale_h)
+        # Work in 8-bit RGB(A); drop the alpha channel if nothing is transparent
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        if img.mode == 'RGBA' and img.getextrema()[3][0] == 255:
+            img = img.convert('RGB')
         
-        # Calculate final dimensions
-        final_width = img_width * scale
-        final_height = img_height * scale
+        # Only ever shrinks, never upscales
+        img.thumbnail(target_size, Image.LANCZOS)
         
-        # Center horizontally only, align to bottom vertically
-        x_offset = x + (width - final_width) / 2
-        y_offset = y  # Align to bottom of section (no vertical centering)
+        if img.mode == 'RGBA':
+            # Keep transparency lossless; ReportLab builds the soft mask from the pixels
+            return ImageReader(img)
         
-        c.drawImage(image_path, x_offset, y_offset, 
-                   width=final_width, height=final_height, 
-                   preserveAspectRatio=True, mask='auto')
+        # Opaque images are embedded as JPEG (DCT) data instead of raw Flate pixels
+        buffer = io.BytesIO()
+        img.save(buffer, 'JPEG', quality=85)
+        buffer.seek(0)
+        return ImageReader(buffer)
     
     def _optimal_line_break(self, text: str, char_threshold: int, max_lines: int = 2):
         """
@@ -110,22 +406,7 @@ class CardGenerator:
         Breaks on spaces and commas.
         """
         # Split on space or comma, keeping the delimiter with the preceding token
-        tokens = []
-        current_token = ""
-        
-        for char in text:
-            if char in [' ', ',']:
-                if current_token:
-                    if char == ',':
-                        tokens.append(current_token + ',')
-                    else:
-                        tokens.append(current_token)
-                    current_token = ""
-            else:
-                current_token += char
-        
-        if current_token:
-            tokens.append(current_token)
+        tokens = _TOKEN_RE.findall(text)
         
         if len(tokens) == 0:
             return [text]
@@ -134,20 +415,10 @@ class CardGenerator:
         
         # For 2 lines, find the optimal break point
         if max_lines == 2:
-            best_break = 0
-            best_first_line_len = 0
-            
-            # Try each possible break point
-            for i in range(1, len(tokens)):
-                first_line = ' '.join(tokens[:i])
-                first_line_len = len(first_line)
-                
-                # Check if this break point is valid (doesn't exceed threshold)
-                if first_line_len <= char_threshold:
-                    # This is a valid break, check if it's closer to threshold
-                    if first_line_len > best_first_line_len:
-                        best_first_line_len = first_line_len
-                        best_break = i
+            # prefix_ends[i - 1] is len(' '.join(tokens[:i])) + 1, increasing in i,
+            # so the longest first line within the threshold is found by bisection
+            prefix_ends = list(itertools.accumulate(len(token) + 1 for token in tokens))
+            best_break = min(bisect.bisect_right(prefix_ends, char_threshold + 1), len(tokens) - 1)
             
             # If we found a valid break point, use it
             if best_break > 0:
@@ -164,15 +435,18 @@ class CardGenerator:
         # For other cases, use simple greedy approach
         lines = []
         current_line = []
+        current_length = 0  # len(' '.join(current_line)), kept instead of re-joining
         
         for token in tokens:
-            test_line = ' '.join(current_line + [token])
-            if len(test_line) <= char_threshold:
+            test_length = current_length + len(token) + (1 if current_line else 0)
+            if test_length <= char_threshold:
                 current_line.append(token)
+                current_length = test_length
             else:
                 if current_line:
                     lines.append(' '.join(current_line))
                     current_line = [token]
+                    current_length = len(token)
                 else:
                     lines.append(token)
                 
@@ -194,14 +468,14 @@ class CardGenerator:
         
         if not allow_multiline or max_lines == 1:
             # Single line mode
-            text_width = c.stringWidth(text, font, font_size)
+            text_width = _string_width(text, font, font_size)
             max_width = width - (2 * text_padding)
             
             if text_width > max_width:
                 scale_factor = max_width / text_width
                 font_size = int(font_size * scale_factor)
                 c.setFont(font, font_size)
-                text_width = c.stringWidth(text, font, font_size)
+                text_width = _string_width(text, font, font_size)
             
             text_x = x + (width - text_width) / 2
             text_y = y + (height - font_size) / 2
@@ -216,7 +490,7 @@ class CardGenerator:
             start_y = y + (height - total_height) / 2 + (len(lines) - 1) * line_height
             
             for i, line in enumerate(lines):
-                line_width = c.stringWidth(line, font, font_size)
+                line_width = _string_width(line, font, font_size)
                 text_x = x + (width - line_width) / 2
                 text_y = start_y - (i * line_height)
                 c.drawString(text_x, text_y, line)
@@ -224,16 +498,22 @@ class CardGenerator:
     def _draw_wrapped_text(self, c, text: str, x: float, y: float, 
                           width: float, height: float, font_size: int, text_padding: float = 10):
         """Draw wrapped text centered within a box."""
-        style = ParagraphStyle(
-            'centered',
-            fontName='Helvetica',
-            fontSize=font_size,
-            alignment=TA_CENTER,
-            leading=font_size * 1.25
-        )
-        
-        para = Paragraph(text, style)
-        para_width, para_height = para.wrap(width - (2 * text_padding), height)
+        # The message is the same on every card, so parse and wrap it once and redraw it
+        key = (text, font_size, width, height, text_padding)
+        cached = self._paragraph_cache.get(key)
+        if cached is None:
+            style = ParagraphStyle(
+                'centered',
+                fontName='Helvetica',
+                fontSize=font_size,
+                alignment=TA_CENTER,
+                leading=font_size * 1.25
+            )
+            
+            para = Paragraph(text, style)
+            para_width, para_height = para.wrap(width - (2 * text_padding), height)
+            cached = self._paragraph_cache[key] = (para, para_height)
+        para, para_height = cached
         
         # Center vertically
         y_offset = y + (height - para_height) / 2
@@ -241,12 +521,7 @@ class CardGenerator:
     
     def _sanitize_filename(self, name: str) -> str:
         """Convert name to safe filename."""
-        # Remove/replace unsafe characters
-        safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' 
-                           for c in name)
-        # Replace spaces with underscores and convert to lowercase
-        safe_name = safe_name.strip().replace(' ', '_').lower()
-        return safe_name
+        return _safe_filename(name)
     
     def generate_card(self, person_name: str, person_image_path: str, 
                      output_path: str) -> bool:
@@ -254,83 +529,55 @@ class CardGenerator:
         
         # Validate inputs
         full_image_path = self.base_dir / person_image_path
-        if not self._validate_image(full_image_path):
-            return False
-        
-        qr_code_path = self.base_dir / self.config['qr_code_path']
-        if not self._validate_image(qr_code_path):
-            print(f"Error: QR code not found: {qr_code_path}")
+        if self._probe_image(full_image_path) is None:
             return False
         
-        cfg = self.config
+        return self._render_card(person_name, person_image_path, output_path)
+    
+    def _render_card(self, person_name: str, person_image_path: str,
+                     output_path: str) -> bool:
+        """Draw and save a card whose person image has already been validated."""
+        full_image_path = self.base_dir / person_image_path
+        plan = self._plan
         
         # Create PDF
-        print(f"  Creating PDF...")
+        self._debug(f"  Creating PDF...")
         try:
-            # Page dimensions in points
-            page_width = cfg['page_width_pt']
-            page_height = cfg['page_height_pt']
-            
-            # Layout parameters
-            h_padding = cfg['horizontal_padding_pt']
-            top_padding = cfg.get('top_padding_pt', 0)
-            bottom_padding = cfg.get('bottom_padding_pt', 0)
-            top_margin = cfg['top_margin_pt']
-            text_padding = cfg.get('text_horizontal_padding_pt', 10)
-            content_width = page_width - (2 * h_padding)
-            content_height = page_height - top_padding - bottom_padding
+            page_width = plan.page_width
+            page_height = plan.page_height
+            h_padding = plan.h_padding
+            content_width = plan.content_width
+            text_padding = plan.text_padding
             
             # Debug output
-            print(f"  Page: {page_width}pt × {page_height}pt")
-            print(f"  Content area: {content_width}pt × {content_height}pt")
-            print(f"  Margins - H: {h_padding}pt, Top: {top_padding}pt, Bottom: {bottom_padding}pt")
-            print(f"  Text padding: {text_padding}pt each side")
-            
-            # Determine name box size based on name length
-            name_length_threshold = cfg.get('name_length_threshold', 22)
-            is_long_name = len(person_name) > name_length_threshold
-            
-            if is_long_name:
-                name_height = cfg['name_box_height_pt_long']
-                name_font_size = cfg['name_font_size_pt_long']
-                name_multiline = True
-            else:
-                name_height = cfg['name_box_height_pt_short']
-                name_font_size = cfg['name_font_size_pt_short']
-                name_multiline = False
+            self._debug(f"  Page: {page_width}pt × {page_height}pt")
+            self._debug(f"  Content area: {content_width}pt × {plan.content_height}pt")
+            self._debug(f"  Margins - H: {h_padding}pt, Top: {plan.top_padding}pt, Bottom: {plan.bottom_padding}pt")
+            self._debug(f"  Text padding: {text_padding}pt each side")
             
-            # Section heights
-            photo_height = cfg['photo_section_height_pt']
-            qr_height = cfg['qr_section_height_pt']
-            gap_before_msg = cfg['gap_before_message_pt']
-            message_height = cfg['message_box_height_pt']
-            bottom_box_height = cfg.get('bottom_box_height_pt', 0)
+            # Determine name box size (and with it every Y position) based on name length
+            is_long_name = len(person_name) > plan.name_length_threshold
+            layout = plan.layout_long if is_long_name else plan.layout_short
+            
+            name_height = layout.name_height
+            photo_height = plan.photo_height
+            qr_height = plan.qr_height
+            message_height = plan.message_height
+            
+            y_photo = layout.y_photo
+            y_name = layout.y_name
+            y_qr = layout.y_qr
+            y_message = layout.y_message
             
             # Debug output for name handling
-            print(f"  Name: '{person_name}' ({len(person_name)} chars)")
-            print(f"  Name box: {name_height}pt, Font: {name_font_size}pt, Multiline: {name_multiline}")
-            
-            # Calculate Y positions from TOP (convert to bottom-up for ReportLab)
-            # Top positions (from top edge, accounting for top padding)
-            y_top_photo = top_padding + top_margin
-            y_top_name = y_top_photo + photo_height
-            y_top_qr = y_top_name + name_height
-            y_top_message = y_top_qr + qr_height + gap_before_msg
-            y_top_bottom_box = y_top_message + message_height
-            
-            # Convert to ReportLab coordinates (from bottom, accounting for bottom padding)
-            # ReportLab uses bottom-up coordinates, so bottom_padding lifts everything up
-            y_photo = page_height - y_top_photo - photo_height - bottom_padding
-            y_name = page_height - y_top_name - name_height - bottom_padding
-            y_qr = page_height - y_top_qr - qr_height - bottom_padding
-            y_message = page_height - y_top_message - message_height - bottom_padding
-            y_bottom_box = page_height - y_top_bottom_box - bottom_box_height - bottom_padding
+            self._debug(f"  Name: '{person_name}' ({len(person_name)} chars)")
+            self._debug(f"  Name box: {name_height}pt, Font: {layout.name_font_size}pt, Multiline: {layout.name_multiline}")
             
             # Create canvas
             c = canvas.Canvas(output_path, pagesize=(page_width, page_height))
             
             # 1. Fill entire page with light blue background
-            c.setFillColor(HexColor(cfg['background_color']))
+            c.setFillColor(plan.background_color)
             c.rect(0, 0, page_width, page_height, fill=1, stroke=0)
             
             # 2. Draw photo section
@@ -342,125 +589,60 @@ class CardGenerator:
                 content_width, photo_height
             )
             
-            # 3. Draw name box
-            # Calculate name box dimensions with horizontal margins
-            name_h_margin = cfg.get('name_box_horizontal_margin_pt', 0)
-            name_box_x = h_padding + name_h_margin
-            name_box_width = content_width - (2 * name_h_margin)
+            # 3. Draw the white name, QR and message backgrounds in one fill; nonzero winding
+            # keeps boxes that overlap (e.g. a negative gap_before_message_pt) filled
+            c.setFillColor(plan.white)
+            c.drawPath(layout.white_boxes, fill=1, stroke=0, fillMode=canvas.FILL_NON_ZERO)
+            
+            # Draw borders based on config, one stroke per color and width
+            for border_color, border_width, border_path in layout.border_paths:
+                c.setStrokeColor(border_color)
+                c.setLineWidth(border_width)
+                c.drawPath(border_path, stroke=1, fill=0)
             
-            # White background
-            c.setFillColor(HexColor('#FFFFFF'))
-            c.rect(name_box_x, y_name, name_box_width, name_height, fill=1, stroke=0)
-            
-            # Draw borders based on config
-            name_border_sides = cfg.get('name_box_border_sides', [])
-            name_border_width = cfg.get('name_box_border_width_pt', 2)
-            name_border_color = cfg.get('name_box_border_color', '#000000')
-            
-            c.setStrokeColor(HexColor(name_border_color))
-            c.setLineWidth(name_border_width)
-            
-            if 'left' in name_border_sides:
-                c.line(name_box_x, y_name, name_box_x, y_name + name_height)
-            if 'right' in name_border_sides:
-                c.line(name_box_x + name_box_width, y_name, name_box_x + name_box_width, y_name + name_height)
-            if 'top' in name_border_sides:
-                c.line(name_box_x, y_name + name_height, name_box_x + name_box_width, y_name + name_height)
-            if 'bottom' in name_border_sides:
-                c.line(name_box_x, y_name, name_box_x + name_box_width, y_name)
-            
-            # Draw name text within the narrower box
-            c.setFillColor(HexColor('#000000'))
+            # 4. Draw name text within the narrower name box
+            c.setFillColor(plan.black)
             self._draw_centered_text(
                 c, person_name,
-                name_box_x, y_name,
-                name_box_width, name_height,
-                name_font_size,
+                plan.name_box_x, y_name,
+                plan.name_box_width, name_height,
+                layout.name_font_size,
                 bold=False,
                 text_padding=text_padding,
-                allow_multiline=name_multiline,
-                max_lines=cfg.get('name_max_lines', 2),
-                char_threshold=name_length_threshold
+                allow_multiline=layout.name_multiline,
+                max_lines=plan.name_max_lines,
+                char_threshold=plan.name_length_threshold
             )
             
-            # 4. Draw QR section
-            # White background
-            c.setFillColor(HexColor('#FFFFFF'))
-            c.rect(h_padding, y_qr, content_width, qr_height, fill=1, stroke=0)
-            
-            # Draw borders based on config
-            qr_border_sides = cfg.get('qr_section_border_sides', [])
-            qr_border_width = cfg.get('qr_section_border_width_pt', 2)
-            qr_border_color = cfg.get('qr_section_border_color', '#000000')
-            
-            c.setStrokeColor(HexColor(qr_border_color))
-            c.setLineWidth(qr_border_width)
-            
-            if 'left' in qr_border_sides:
-                c.line(h_padding, y_qr, h_padding, y_qr + qr_height)
-            if 'right' in qr_border_sides:
-                c.line(h_padding + content_width, y_qr, h_padding + content_width, y_qr + qr_height)
-            if 'top' in qr_border_sides:
-                c.line(h_padding, y_qr + qr_height, h_padding + content_width, y_qr + qr_height)
-            if 'bottom' in qr_border_sides:
-                c.line(h_padding, y_qr, h_padding + content_width, y_qr)
-            
-            # Draw QR code centered
-            qr_size = cfg['qr_code_size_pt']
-            qr_x = h_padding + (content_width - qr_size) / 2
+            # 5. Draw QR code centered in the QR section
+            qr_size = plan.qr_size
             qr_y = y_qr + (qr_height - qr_size) / 2
-            c.drawImage(str(qr_code_path), qr_x, qr_y, 
+            c.drawImage(self._qr_reader, plan.qr_x, qr_y,
                        width=qr_size, height=qr_size,
                        preserveAspectRatio=True)
             
-            # 5. Draw message box
-            # White background
-            c.setFillColor(HexColor('#FFFFFF'))
-            c.rect(h_padding, y_message, content_width, message_height, fill=1, stroke=0)
-            
-            # Draw borders based on config
-            msg_border_sides = cfg.get('message_box_border_sides', [])
-            msg_border_width = cfg.get('message_box_border_width_pt', 2)
-            msg_border_color = cfg.get('message_box_border_color', '#000000')
-            
-            c.setStrokeColor(HexColor(msg_border_color))
-            c.setLineWidth(msg_border_width)
-            
-            if 'left' in msg_border_sides:
-                c.line(h_padding, y_message, h_padding, y_message + message_height)
-            if 'right' in msg_border_sides:
-                c.line(h_padding + content_width, y_message, h_padding + content_width, y_message + message_height)
-            if 'top' in msg_border_sides:
-                c.line(h_padding, y_message + message_height, h_padding + content_width, y_message + message_height)
-            if 'bottom' in msg_border_sides:
-                c.line(h_padding, y_message, h_padding + content_width, y_message)
-            
-            # Draw message text
-            c.setFillColor(HexColor('#000000'))
+            # 6. Draw message text
             self._draw_wrapped_text(
-                c, cfg['message_text'],
+                c, plan.message_text,
                 h_padding, y_message,
                 content_width, message_height,
-                cfg['message_font_size_pt'],
+                plan.message_font_size,
                 text_padding=text_padding
             )
             
-            # 6. Draw bottom box (if height > 0)
-            if bottom_box_height > 0:
-                # Calculate bottom box dimensions with horizontal margins
-                bottom_h_margin = cfg.get('bottom_box_horizontal_margin_pt', 0)
-                bottom_box_x = h_padding + bottom_h_margin
-                bottom_box_width = content_width - (2 * bottom_h_margin)
-                
+            # 7. Draw bottom box (if height > 0)
+            # Filled last, over the edge of the message border, as it always has been
+            if plan.bottom_box_height > 0:
                 # White background (no borders)
-                c.setFillColor(HexColor('#FFFFFF'))
-                c.rect(bottom_box_x, y_bottom_box, bottom_box_width, bottom_box_height, fill=1, stroke=0)
+                c.setFillColor(plan.white)
+                c.rect(plan.bottom_box_x, layout.y_bottom_box, plan.bottom_box_width, plan.bottom_box_height,
+                       fill=1, stroke=0)
             
             # Remaining space stays blue (already filled)
             
             # Save PDF
             c.save()
-            print(f"  ✓ Successfully created: {output_path}")
+            self._debug(f"  ✓ Successfully created: {output_path}")
             return True
             
         except Exception as e:
@@ -468,61 +650,113 @@ class CardGenerator:
             traceback.print_exc()
             return False
     
-    def generate_all_cards(self) -> None:
-        """Generate PDF cards for all entries in CSV."""
-        
-        # Create output directory
-        output_dir = self.base_dir / self.config['output_directory']
-        output_dir.mkdir(exist_ok=True)
+    def _generate_card_task(self, task: tuple) -> bool:
+        """Generate the card for one (idx, total, name, image, output_path) task."""
+        idx, total, person_name, person_image, output_path = task
+        print(f"[{idx}/{total}] Processing: {person_name}")
         
-        # Read CSV data
-        print("Reading CSV data...")
-        data = self._read_csv_data()
-        print(f"Found {len(data)} entries to process.\n")
+        # Generate card (the planner has already validated the image)
+        success = self._render_card(person_name, person_image, output_path)
         
-        # Generate cards
-        success_count = 0
-        fail_count = 0
-        
-        for idx, row in enumerate(data, 1):
-            person_name = row.get('name', '').strip()
-            person_image = row.get('image', '').strip()
-            
+        self._debug("")
+        return success
+    
+    def _plan_tasks(self, csv_path: Path, total: int, output_dir: Path, skipped: List[int]) -> Iterator[tuple]:
+        """
+        Yield a card task per valid CSV row as it is read. Rows with missing data or an
+        unreadable person image are reported and recorded in skipped, so they never reach a worker.
+        """
+        for idx, (person_name, person_image) in enumerate(self._read_csv_data(csv_path), 1):
             if not person_name or not person_image:
-                print(f"[{idx}/{len(data)}] Skipping row with missing data")
-                fail_count += 1
+                print(f"[{idx}/{total}] Skipping row with missing data")
+                skipped.append(idx)
                 continue
             
-            print(f"[{idx}/{len(data)}] Processing: {person_name}")
+            if self._probe_image(self.base_dir / person_image) is None:
+                print(f"[{idx}/{total}] Skipping {person_name}: person image is missing or invalid")
+                skipped.append(idx)
+                continue
             
             # Generate output filename
             safe_name = self._sanitize_filename(person_name)
             output_filename = f"{safe_name}.pdf"
             output_path = output_dir / output_filename
             
-            # Generate card
-            if self.generate_card(person_name, person_image, str(output_path)):
-                success_count += 1
+            yield (idx, total, person_name, person_image, str(output_path))
+    
+    def generate_all_cards(self) -> None:
+        """Generate PDF cards for all entries in CSV."""
+        
+        # Create output directory
+        output_dir = self.base_dir / self.config['output_directory']
+        output_dir.mkdir(exist_ok=True)
+        
+        # Count CSV rows up front; the rows themselves are streamed to the workers
+        print("Reading CSV data...")
+        csv_path = self._get_csv_path()
+        total = self._count_csv_rows(csv_path)
+        print(f"Found {total} entries to process.\n")
+        
+        # Generate cards
+        skipped = []
+        tasks = self._plan_tasks(csv_path, total, output_dir, skipped)
+        
+        # rl_config is shared by the whole process, so restore it after this run
+        saved_use_a85 = rl_config.useA85
+        self._apply_fast_pdf()
+        try:
+            # Cards are independent, so spread them across CPU cores
+            if total > 1:
+                workers = min(os.cpu_count() or 1, total)
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.config, self.verbose)) as executor:
+                    # Send tasks in chunks on large CSVs, but keep every worker busy on small ones
+                    chunksize = max(1, total // (workers * 4))
+                    results = list(executor.map(_generate_card_task, tasks, chunksize=chunksize))
             else:
-                fail_count += 1
-            
-            print()
+                results = [self._generate_card_task(task) for task in tasks]
+        finally:
+            rl_config.useA85 = saved_use_a85
+        
+        success_count = sum(results)
+        fail_count = len(skipped) + len(results) - success_count
         
         # Summary
         print("=" * 60)
         print(f"GENERATION COMPLETE")
-        print(f"  Total: {len(data)}")
+        print(f"  Total: {total}")
         print(f"  Success: {success_count}")
         print(f"  Failed: {fail_count}")
         print(f"  Output directory: {output_dir}")
         print("=" * 60)
 
 
+# Per-process generator for pool workers, built once from the parent's config
+_worker_generator = None
+
+
+def _init_worker(config: Dict, verbose: bool) -> None:
+    """Create the worker process's CardGenerator."""
+    global _worker_generator
+    _worker_generator = CardGenerator(config=config, verbose=verbose)
+    _worker_generator._apply_fast_pdf()
+
+
+def _generate_card_task(task: tuple) -> bool:
+    """Generate one card in a worker process."""
+    return _worker_generator._generate_card_task(task)
+
+
 def main():
     """Main entry point."""
     
-    # Check for arguments
-    config_file = sys.argv[1] if len(sys.argv) > 1 else "config.json"
+    parser = argparse.ArgumentParser(description='Generate PDF cards from a CSV file')
+    parser.add_argument('config', nargs='?', default='config.json',
+                        help='Path to configuration file (default: config.json)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Print per-card layout details')
+    args = parser.parse_args()
+    config_file = args.config
     
     print("=" * 60)
     print("PDF CARD GENERATOR")
@@ -530,7 +764,7 @@ def main():
     print(f"Configuration: {config_file}\n")
     
     # Create generator and run
-    generator = CardGenerator(config_file)
+    generator = CardGenerator(config_file, verbose=args.verbose)
     generator.generate_all_cards()
 
 
@@ -6,29 +6,91 @@ Uses the same configuration as PDF generator.
 """
 
 import os
+import re
 import sys
 import json
 import csv
+import argparse
+import bisect
+import functools
+import itertools
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
 
 
+# A name token: a run of characters up to the next space or comma, keeping a trailing comma
+_TOKEN_RE = re.compile(r'[^ ,]+,?')
+
+# Characters not allowed in output filenames (\w is exactly str.isalnum() plus '_')
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w -]')
+
+# Filters selectable for the person photo with the photo_resample setting
+_PHOTO_RESAMPLE_FILTERS = {
+    'lanczos': Image.Resampling.LANCZOS,
+    'bicubic': Image.Resampling.BICUBIC,
+    'bilinear': Image.Resampling.BILINEAR,
+    'box': Image.Resampling.BOX,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _safe_filename(name: str) -> str:
+    """Convert name to safe filename (see PNGCardGenerator._sanitize_filename)."""
+    # Replace unsafe characters, then spaces with underscores, and convert to lowercase
+    return _UNSAFE_FILENAME_RE.sub('_', name).strip().replace(' ', '_').lower()
+
+
+@functools.lru_cache(maxsize=64)
+def _load_font(size: int, bold: bool) -> ImageFont.FreeTypeFont:
+    """Load a font at the specified size, once per (size, bold) since card text repeats sizes."""
+    # Try to use Helvetica-like fonts, fall back to default
+    font_paths = [
+        '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf' if bold else '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf' if bold else '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+        '/System/Library/Fonts/Helvetica.ttc',
+    ]
+
+    for font_path in font_paths:
+        if os.path.exists(font_path):
+            try:
+                return ImageFont.truetype(font_path, size)
+            except:
+                pass
+
+    # Fall back to default font
+    return ImageFont.load_default()
+
+
 class PNGCardGenerator:
     """Generates PNG cards from CSV input and configuration."""
 
-    def __init__(self, config_path: str = "config.json", scale_factor: int = 4):
+    def __init__(self, config_path: str = "config.json", scale_factor: int = 4,
+                 config: Optional[Dict] = None, verbose: bool = False):
         """
         Initialize with configuration file.
 
         Args:
             config_path: Path to JSON configuration file
             scale_factor: Multiplier for resolution (default 4 = 288 DPI equivalent)
+            config: Already loaded configuration, used instead of config_path if given
+            verbose: Also print per-card layout details
         """
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
+        self.verbose = verbose
         self.base_dir = Path(__file__).parent
         self.scale_factor = scale_factor  # For high-resolution output
+        self._box_templates: Dict[tuple, Image.Image] = {}
+        self._plan = self._build_plan()
+        self._qr_image = self._load_qr_code()
+
+    def _debug(self, message: str) -> None:
+        """Print per-card detail output, only in verbose mode."""
+        if self.verbose:
+            print(message)
 
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file."""
@@ -42,41 +104,82 @@ class PNGCardGenerator:
             print(f"Error: Invalid JSON in configuration file: {e}")
             sys.exit(1)
 
-    def _validate_image(self, image_path: str) -> bool:
-        """Validate that image exists and is readable."""
+    def _open_image(self, image_path: str) -> Optional[Image.Image]:
+        """
+        Open an image if it exists and is readable, or return None with a warning.
+        Only the header is parsed here (no separate verify() pass); pixels are decoded on use.
+        """
         if not os.path.exists(image_path):
             print(f"Warning: Image not found: {image_path}")
-            return False
+            return None
 
         try:
-            with Image.open(image_path) as img:
-                img.verify()
-            return True
+            return Image.open(image_path)
         except Exception as e:
             print(f"Warning: Invalid image file {image_path}: {e}")
-            return False
+            return None
+
+    def _load_qr_code(self) -> Image.Image:
+        """Validate the QR code and resize it once; every card pastes the same image."""
+        qr_code_path = self.base_dir / self.config['qr_code_path']
+        qr_img = self._open_image(qr_code_path)
+        if qr_img is None:
+            print(f"Error: QR code not found: {qr_code_path}")
+            sys.exit(1)
 
-    def _read_csv_data(self) -> List[Dict]:
-        """Read person data from CSV file."""
+        qr_size = self._plan.qr_size
+        with qr_img:
+            if qr_img.mode not in ('RGB', 'RGBA'):
+                qr_img = qr_img.convert('RGBA')
+            qr_img = qr_img.resize((qr_size, qr_size), Image.Resampling.LANCZOS)
+            return qr_img if qr_img.mode == 'RGBA' else qr_img.convert('RGBA')
+
+    def _get_csv_path(self) -> Path:
+        """Resolve the input CSV path, exiting if it does not exist."""
         csv_path = self.base_dir / self.config['input_csv']
 
         if not csv_path.exists():
             print(f"Error: CSV file not found: {csv_path}")
             sys.exit(1)
 
-        data = []
+        return csv_path
+
+    def _count_csv_rows(self, csv_path: Path) -> int:
+        """Count data rows without keeping them, skipping blank lines like DictReader."""
         with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data.append(row)
+            return max(0, sum(1 for row in csv.reader(f) if row) - 1)
+
+    def _read_csv_data(self, csv_path: Path) -> Iterator[Tuple[str, str]]:
+        """
+        Stream (name, image) pairs from CSV file one row at a time.
+        Columns are looked up by header position once; blank lines are skipped and
+        missing columns or fields read as empty strings, as with DictReader.
+        """
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
 
-        return data
+            # Positions past the end of any row stand in for missing columns
+            name_idx = header.index('name') if 'name' in header else len(header)
+            image_idx = header.index('image') if 'image' in header else len(header)
+
+            for row in reader:
+                if not row:
+                    continue
+                person_name = row[name_idx].strip() if name_idx < len(row) else ''
+                person_image = row[image_idx].strip() if image_idx < len(row) else ''
+                yield person_name, person_image
 
-    def _paste_centered_image(self, canvas: Image.Image, image_path: str,
+    def _paste_centered_image(self, canvas: Image.Image, image: Image.Image,
                              x: int, y: int, width: int, height: int) -> None:
-        """Paste an image centered horizontally, filling the height, maintaining aspect ratio."""
-        with Image.open(image_path) as img:
-            img = img.convert('RGBA')
+        """Paste an image cropped to fill the section, centered horizontally and aligned to top."""
+        with image as img:
+            # RGB and RGBA are resized as they are; an opaque RGB photo gains its
+            # alpha channel when pasted, after resizing rather than before
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA')
             img_width, img_height = img.size
 
             # Scale to fill the section
@@ -84,41 +187,29 @@ class PNGCardGenerator:
             scale_w = width / img_width
             scale = max(scale_w, scale_h)
 
-            # Calculate final dimensions
-            final_width = int(img_width * scale)
-            final_height = int(img_height * scale)
+            # Source region that fills the section: centered horizontally, aligned to top
+            crop_width = width / scale
+            crop_height = height / scale
+            crop_left = (img_width - crop_width) / 2
+            crop_box = (crop_left, 0, crop_left + crop_width, crop_height)
 
-            # Resize image
-            img_resized = img.resize((final_width, final_height), Image.Resampling.LANCZOS)
+            # Crop and resize in one pass so only the visible pixels are filtered;
+            # by default area-average when shrinking and bilinear when enlarging,
+            # which look the same as LANCZOS on photos at a fraction of the cost
+            resample = self._plan.photo_resample
+            if resample is None:
+                resample = Image.Resampling.BOX if scale < 1 else Image.Resampling.BILINEAR
+            img_resized = img.resize((width, height), resample, box=crop_box)
 
-            # Center horizontally, align to top vertically
-            x_offset = x + (width - final_width) // 2
-            y_offset = y
-
-            # Paste image (crop if necessary)
-            canvas.paste(img_resized, (x_offset, y_offset))
+            canvas.paste(img_resized, (x, y))
 
     def _optimal_line_break(self, text: str, char_threshold: int, max_lines: int = 2) -> List[str]:
         """
         Break text into lines optimally based on character threshold.
         Same logic as PDF generator.
         """
-        tokens = []
-        current_token = ""
-
-        for char in text:
-            if char in [' ', ',']:
-                if current_token:
-                    if char == ',':
-                        tokens.append(current_token + ',')
-                    else:
-                        tokens.append(current_token)
-                    current_token = ""
-            else:
-                current_token += char
-
-        if current_token:
-            tokens.append(current_token)
+        # Split on space or comma, keeping the delimiter with the preceding token
+        tokens = _TOKEN_RE.findall(text)
 
         if len(tokens) == 0:
             return [text]
@@ -127,17 +218,10 @@ class PNGCardGenerator:
 
         # For 2 lines, find the optimal break point
         if max_lines == 2:
-            best_break = 0
-            best_first_line_len = 0
-
-            for i in range(1, len(tokens)):
-                first_line = ' '.join(tokens[:i])
-                first_line_len = len(first_line)
-
-                if first_line_len <= char_threshold:
-                    if first_line_len > best_first_line_len:
-                        best_first_line_len = first_line_len
-                        best_break = i
+            # prefix_ends[i - 1] is len(' '.join(tokens[:i])) + 1, increasing in i,
+            # so the longest first line within the threshold is found by bisection
+            prefix_ends = list(itertools.accumulate(len(token) + 1 for token in tokens))
+            best_break = min(bisect.bisect_right(prefix_ends, char_threshold + 1), len(tokens) - 1)
 
             if best_break > 0:
                 first_line = ' '.join(tokens[:best_break])
@@ -152,15 +236,18 @@ class PNGCardGenerator:
         # For other cases, use simple greedy approach
         lines = []
         current_line = []
+        current_length = 0  # len(' '.join(current_line)), kept instead of re-joining
 
         for token in tokens:
-            test_line = ' '.join(current_line + [token])
-            if len(test_line) <= char_threshold:
+            test_length = current_length + len(token) + (1 if current_line else 0)
+            if test_length <= char_threshold:
                 current_line.append(token)
+                current_length = test_length
             else:
                 if current_line:
                     lines.append(' '.join(current_line))
                     current_line = [token]
+                    current_length = len(token)
                 else:
                     lines.append(token)
 
@@ -174,22 +261,7 @@ class PNGCardGenerator:
 
     def _get_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         """Get a font at the specified size."""
-        # Try to use Helvetica-like fonts, fall back to default
-        font_paths = [
-            '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf' if bold else '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
-            '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf' if bold else '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
-            '/System/Library/Fonts/Helvetica.ttc',
-        ]
-
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    return ImageFont.truetype(font_path, size)
-                except:
-                    pass
-
-        # Fall back to default font
-        return ImageFont.load_default()
+        return _load_font(size, bold)
 
     def _draw_centered_text(self, draw: ImageDraw.Draw, text: str,
                            x: int, y: int, width: int, height: int,
@@ -197,6 +269,10 @@ class PNGCardGenerator:
                            text_padding: int = 10, allow_multiline: bool = False,
                            max_lines: int = 1, char_threshold: int = 22) -> None:
         """Draw centered text within a box."""
+        # Blank text draws nothing; skip the font lookup and measuring
+        if not text or not text.strip():
+            return
+
         font = self._get_font(font_size, bold)
 
         if not allow_multiline or max_lines == 1:
@@ -235,10 +311,10 @@ class PNGCardGenerator:
                 text_y = start_y + (i * line_height)
                 draw.text((text_x, text_y), line, fill='black', font=font)
 
-    def _draw_wrapped_text(self, draw: ImageDraw.Draw, text: str,
-                          x: int, y: int, width: int, height: int,
-                          font_size: int, text_padding: int = 10) -> None:
-        """Draw wrapped text centered within a box."""
+    def _wrapped_text_lines(self, draw: ImageDraw.Draw, text: str,
+                            x: int, y: int, width: int, height: int,
+                            font_size: int) -> Tuple[ImageFont.FreeTypeFont, List[Tuple[Tuple[int, int], str]]]:
+        """Font and ((x, y), line) placements for wrapped text centered within a box."""
         font = self._get_font(font_size)
 
         # Replace <br/> with newlines
@@ -252,279 +328,311 @@ class PNGCardGenerator:
         total_height = len(lines) * line_height
         start_y = y + (height - total_height) // 2
 
+        placements = []
         for i, line in enumerate(lines):
             bbox = draw.textbbox((0, 0), line, font=font)
             line_width = bbox[2] - bbox[0]
             text_x = x + (width - line_width) // 2
             text_y = start_y + (i * line_height)
-            draw.text((text_x, text_y), line, fill='black', font=font)
+            placements.append(((text_x, text_y), line))
+
+        return font, placements
+
+    def _draw_wrapped_text(self, draw: ImageDraw.Draw, text: str,
+                          x: int, y: int, width: int, height: int,
+                          font_size: int, text_padding: int = 10) -> None:
+        """Draw wrapped text centered within a box."""
+        if not text or not text.strip():
+            return
+
+        font, placements = self._wrapped_text_lines(draw, text, x, y, width, height, font_size)
+        for position, line in placements:
+            draw.text(position, line, fill='black', font=font)
+
+    def _prerender_message(self, box: Image.Image, text: str, font_size: int,
+                           text_padding: int) -> Optional[Image.Image]:
+        """
+        Draw the message onto a copy of its box template, since it is identical on every card.
+        Returns None if the text would spill outside the box; it is then drawn on each card instead.
+        """
+        message = box.copy()
+        draw = ImageDraw.Draw(message)
+
+        # The template covers both edge coordinates, so the box itself is one pixel smaller
+        font, placements = self._wrapped_text_lines(
+            draw, text, 0, 0, message.width - 1, message.height - 1, font_size
+        )
+        for position, line in placements:
+            left, top, right, bottom = draw.textbbox(position, line, font=font)
+            if left < 0 or top < 0 or right > message.width or bottom > message.height:
+                return None
+
+        self._draw_wrapped_text(draw, text, 0, 0, message.width - 1, message.height - 1,
+                                font_size, text_padding=text_padding)
+        return message
 
     def _sanitize_filename(self, name: str) -> str:
         """Convert name to safe filename."""
-        safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_'
-                           for c in name)
-        safe_name = safe_name.strip().replace(' ', '_').lower()
-        return safe_name
+        return _safe_filename(name)
 
     def _hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """Convert hex color to RGB tuple."""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-    def generate_card(self, person_name: str, person_image_path: str,
-                     output_path: str) -> bool:
-        """Generate a single PNG card."""
-
-        # Validate inputs
-        full_image_path = self.base_dir / person_image_path
-        if not self._validate_image(full_image_path):
-            return False
-
-        qr_code_path = self.base_dir / self.config['qr_code_path']
-        if not self._validate_image(qr_code_path):
-            print(f"Error: QR code not found: {qr_code_path}")
-            return False
-
+    def _build_plan(self) -> SimpleNamespace:
+        """
+        Precompute everything in the card layout that depends only on the configuration:
+        scaled dimensions, colors, box templates and the Y positions for short and long names.
+        """
         cfg = self.config
 
-        print(f"  Creating PNG...")
+        # Scale all dimensions
+        def scale(val):
+            return int(val * self.scale_factor)
+
         try:
             # Page dimensions (scaled for high resolution)
-            page_width = int(cfg['page_width_pt'] * self.scale_factor)
-            page_height = int(cfg['page_height_pt'] * self.scale_factor)
-
-            # Scale all dimensions
-            def scale(val):
-                return int(val * self.scale_factor)
+            page_width = scale(cfg['page_width_pt'])
+            page_height = scale(cfg['page_height_pt'])
 
             # Layout parameters
             h_padding = scale(cfg['horizontal_padding_pt'])
             top_padding = scale(cfg.get('top_padding_pt', 0))
-            bottom_padding = scale(cfg.get('bottom_padding_pt', 0))
             top_margin = scale(cfg['top_margin_pt'])
-            text_padding = scale(cfg.get('text_horizontal_padding_pt', 10))
             content_width = page_width - (2 * h_padding)
 
-            # Debug output
-            print(f"  Page: {page_width}px × {page_height}px (scale {self.scale_factor}x)")
-            print(f"  Content area: {content_width}px × ?px")
-
-            # Determine name box size based on name length
-            name_length_threshold = cfg.get('name_length_threshold', 22)
-            is_long_name = len(person_name) > name_length_threshold
-
-            if is_long_name:
-                name_height = scale(cfg['name_box_height_pt_long'])
-                name_font_size = scale(cfg['name_font_size_pt_long'])
-                name_multiline = True
-            else:
-                name_height = scale(cfg['name_box_height_pt_short'])
-                name_font_size = scale(cfg['name_font_size_pt_short'])
-                name_multiline = False
-
             # Section heights
             photo_height = scale(cfg['photo_section_height_pt'])
             qr_height = scale(cfg['qr_section_height_pt'])
             gap_before_msg = scale(cfg['gap_before_message_pt'])
             message_height = scale(cfg['message_box_height_pt'])
-            bottom_box_height = scale(cfg.get('bottom_box_height_pt', 0))
+            qr_size = scale(cfg['qr_code_size_pt'])
 
-            print(f"  Name: '{person_name}' ({len(person_name)} chars)")
-            print(f"  Name box: {name_height}px, Font: {name_font_size}px, Multiline: {name_multiline}")
+            # Name box and bottom box are inset by their horizontal margins
+            name_h_margin = scale(cfg.get('name_box_horizontal_margin_pt', 0))
+            bottom_h_margin = scale(cfg.get('bottom_box_horizontal_margin_pt', 0))
+            name_box_x = h_padding + name_h_margin
+            name_box_width = content_width - (2 * name_h_margin)
 
-            # Calculate Y positions (top-down for PIL)
-            y_photo = top_padding + top_margin
-            y_name = y_photo + photo_height
-            y_qr = y_name + name_height
-            y_message = y_qr + qr_height + gap_before_msg
-            y_bottom_box = y_message + message_height
+            def layout(name_height: int, name_font_size: int, name_multiline: bool) -> SimpleNamespace:
+                # Calculate Y positions (top-down for PIL)
+                y_photo = top_padding + top_margin
+                y_name = y_photo + photo_height
+                y_qr = y_name + name_height
+                y_message = y_qr + qr_height + gap_before_msg
+
+                return SimpleNamespace(
+                    name_height=name_height,
+                    name_font_size=name_font_size,
+                    name_multiline=name_multiline,
+                    y_photo=y_photo,
+                    y_name=y_name,
+                    y_qr=y_qr,
+                    y_qr_code=y_qr + (qr_height - qr_size) // 2,
+                    y_message=y_message,
+                    y_bottom_box=y_message + message_height,
+                    name_box=self._box_template(
+                        name_box_width, name_height,
+                        cfg.get('name_box_border_sides', []),
+                        scale(cfg.get('name_box_border_width_pt', 2)),
+                        cfg.get('name_box_border_color', '#000000')
+                    ),
+                )
 
-            # Create canvas with background color (or transparent)
+            # Person photo filter (None picks one per photo)
+            photo_resample = str(cfg.get('photo_resample', 'auto')).lower()
+            if photo_resample != 'auto' and photo_resample not in _PHOTO_RESAMPLE_FILTERS:
+                print(f"Error: Invalid photo_resample in configuration: '{photo_resample}' "
+                      f"(use auto, {', '.join(_PHOTO_RESAMPLE_FILTERS)})")
+                sys.exit(1)
+
+            # Message box with the message already drawn in, if it fits
+            text_padding = scale(cfg.get('text_horizontal_padding_pt', 10))
+            message_font_size = scale(cfg['message_font_size_pt'])
+            message_box = self._box_template(
+                content_width, message_height,
+                cfg.get('message_box_border_sides', []),
+                scale(cfg.get('message_box_border_width_pt', 2)),
+                cfg.get('message_box_border_color', '#000000')
+            )
+            message_card = self._prerender_message(message_box, cfg['message_text'],
+                                                   message_font_size, text_padding)
+
+            # Background color (or transparent)
             bg_color_str = cfg.get('background_color', '#8DC5FE')
-            use_transparent = bg_color_str.lower() in ['transparent', '', 'none']
+            if bg_color_str.lower() in ['transparent', '', 'none']:
+                background = (0, 0, 0, 0)
+                background_label = 'Transparent'
+            else:
+                background = self._hex_to_rgb(bg_color_str) + (255,)
+                background_label = bg_color_str
+
+            return SimpleNamespace(
+                page_width=page_width,
+                page_height=page_height,
+                h_padding=h_padding,
+                text_padding=text_padding,
+                content_width=content_width,
+                photo_height=photo_height,
+                message_height=message_height,
+                name_length_threshold=cfg.get('name_length_threshold', 22),
+                name_max_lines=cfg.get('name_max_lines', 2),
+                layout_short=layout(scale(cfg['name_box_height_pt_short']),
+                                    scale(cfg['name_font_size_pt_short']), False),
+                layout_long=layout(scale(cfg['name_box_height_pt_long']),
+                                   scale(cfg['name_font_size_pt_long']), True),
+                name_box_x=name_box_x,
+                name_box_width=name_box_width,
+                qr_box=self._box_template(
+                    content_width, qr_height,
+                    cfg.get('qr_section_border_sides', []),
+                    scale(cfg.get('qr_section_border_width_pt', 2)),
+                    cfg.get('qr_section_border_color', '#000000')
+                ),
+                qr_size=qr_size,
+                qr_x=h_padding + (content_width - qr_size) // 2,
+                message_box=message_box if message_card is None else message_card,
+                message_prerendered=message_card is not None,
+                message_text=cfg['message_text'],
+                message_font_size=message_font_size,
+                bottom_box_x=h_padding + bottom_h_margin,
+                bottom_box_width=content_width - (2 * bottom_h_margin),
+                bottom_box_height=scale(cfg.get('bottom_box_height_pt', 0)),
+                photo_resample=_PHOTO_RESAMPLE_FILTERS.get(photo_resample),
+                png_compress_level=cfg.get('png_compress_level', 1),
+                background=background,
+                background_label=background_label,
+            )
+        except KeyError as e:
+            print(f"Error: Missing configuration key: {e}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Error: Invalid color in configuration: {e}")
+            sys.exit(1)
 
-            if use_transparent:
-                # Create transparent background (RGBA with alpha=0)
-                canvas = Image.new('RGBA', (page_width, page_height), (0, 0, 0, 0))
-                print(f"  Background: Transparent")
+    def _box_template(self, width: int, height: int, border_sides: List[str],
+                      border_width: int, border_color: str) -> Image.Image:
+        """
+        White box with the given borders, drawn once per distinct box and pasted on every card.
+        Like draw.rectangle, the box covers both edge coordinates, so it is one pixel larger than width x height.
+        """
+        key = (width, height, tuple(border_sides), border_width, border_color)
+        template = self._box_templates.get(key)
+        if template is not None:
+            return template
+
+        template = Image.new('RGBA', (width + 1, height + 1), 'white')
+
+        if border_sides:
+            draw = ImageDraw.Draw(template)
+            border_rgb = self._hex_to_rgb(border_color)
+            if {'left', 'right', 'top', 'bottom'}.issubset(border_sides):
+                # One outlined rectangle; like the per-side fills below, each side is border_width + 1 pixels
+                draw.rectangle([0, 0, width, height], outline=border_rgb, width=border_width + 1)
             else:
-                # Create with solid color background
-                bg_color = self._hex_to_rgb(bg_color_str)
-                canvas = Image.new('RGBA', (page_width, page_height), bg_color + (255,))
-                print(f"  Background: {bg_color_str}")
+                if 'left' in border_sides:
+                    draw.rectangle([0, 0, border_width, height], fill=border_rgb)
+                if 'right' in border_sides:
+                    draw.rectangle([width - border_width, 0, width, height], fill=border_rgb)
+                if 'top' in border_sides:
+                    draw.rectangle([0, 0, width, border_width], fill=border_rgb)
+                if 'bottom' in border_sides:
+                    draw.rectangle([0, height - border_width, width, height], fill=border_rgb)
+
+        self._box_templates[key] = template
+        return template
+
+    def generate_card(self, person_name: str, person_image_path: str,
+                     output_path: str) -> bool:
+        """Generate a single PNG card."""
+
+        # Validate inputs
+        full_image_path = self.base_dir / person_image_path
+        person_image = self._open_image(full_image_path)
+        if person_image is None:
+            return False
+
+        plan = self._plan
+
+        self._debug(f"  Creating PNG...")
+        try:
+            page_width = plan.page_width
+            page_height = plan.page_height
+            h_padding = plan.h_padding
+            content_width = plan.content_width
+
+            # Debug output
+            self._debug(f"  Page: {page_width}px × {page_height}px (scale {self.scale_factor}x)")
+            self._debug(f"  Content area: {content_width}px × ?px")
+
+            # Determine name box size (and with it every Y position) based on name length
+            is_long_name = len(person_name) > plan.name_length_threshold
+            layout = plan.layout_long if is_long_name else plan.layout_short
+
+            self._debug(f"  Name: '{person_name}' ({len(person_name)} chars)")
+            self._debug(f"  Name box: {layout.name_height}px, Font: {layout.name_font_size}px, Multiline: {layout.name_multiline}")
+
+            # Create canvas with background color (or transparent)
+            canvas = Image.new('RGBA', (page_width, page_height), plan.background)
+            self._debug(f"  Background: {plan.background_label}")
 
             draw = ImageDraw.Draw(canvas)
 
             # 1. Draw photo section
             self._paste_centered_image(
-                canvas, str(full_image_path),
-                h_padding, y_photo,
-                content_width, photo_height
+                canvas, person_image,
+                h_padding, layout.y_photo,
+                content_width, plan.photo_height
             )
 
-            # 2. Draw name box
-            name_h_margin = scale(cfg.get('name_box_horizontal_margin_pt', 0))
-            name_box_x = h_padding + name_h_margin
-            name_box_width = content_width - (2 * name_h_margin)
-
-            # White background
-            draw.rectangle(
-                [name_box_x, y_name, name_box_x + name_box_width, y_name + name_height],
-                fill='white'
-            )
-
-            # Draw borders
-            name_border_sides = cfg.get('name_box_border_sides', [])
-            name_border_width = scale(cfg.get('name_box_border_width_pt', 2))
-            name_border_color = cfg.get('name_box_border_color', '#000000')
-
-            if name_border_sides:
-                border_rgb = self._hex_to_rgb(name_border_color)
-                if 'left' in name_border_sides:
-                    draw.rectangle(
-                        [name_box_x, y_name, name_box_x + name_border_width, y_name + name_height],
-                        fill=border_rgb
-                    )
-                if 'right' in name_border_sides:
-                    draw.rectangle(
-                        [name_box_x + name_box_width - name_border_width, y_name,
-                         name_box_x + name_box_width, y_name + name_height],
-                        fill=border_rgb
-                    )
-                if 'top' in name_border_sides:
-                    draw.rectangle(
-                        [name_box_x, y_name, name_box_x + name_box_width, y_name + name_border_width],
-                        fill=border_rgb
-                    )
-                if 'bottom' in name_border_sides:
-                    draw.rectangle(
-                        [name_box_x, y_name + name_height - name_border_width,
-                         name_box_x + name_box_width, y_name + name_height],
-                        fill=border_rgb
-                    )
+            # 2. Draw name box (white background and borders)
+            canvas.paste(layout.name_box, (plan.name_box_x, layout.y_name))
 
             # Draw name text
             self._draw_centered_text(
                 draw, person_name,
-                name_box_x, y_name,
-                name_box_width, name_height,
-                name_font_size,
+                plan.name_box_x, layout.y_name,
+                plan.name_box_width, layout.name_height,
+                layout.name_font_size,
                 bold=False,
-                text_padding=text_padding,
-                allow_multiline=name_multiline,
-                max_lines=cfg.get('name_max_lines', 2),
-                char_threshold=name_length_threshold
-            )
-
-            # 3. Draw QR section
-            # White background
-            draw.rectangle(
-                [h_padding, y_qr, h_padding + content_width, y_qr + qr_height],
-                fill='white'
-            )
-
-            # Draw borders
-            qr_border_sides = cfg.get('qr_section_border_sides', [])
-            qr_border_width = scale(cfg.get('qr_section_border_width_pt', 2))
-            qr_border_color = cfg.get('qr_section_border_color', '#000000')
-
-            if qr_border_sides:
-                border_rgb = self._hex_to_rgb(qr_border_color)
-                if 'left' in qr_border_sides:
-                    draw.rectangle(
-                        [h_padding, y_qr, h_padding + qr_border_width, y_qr + qr_height],
-                        fill=border_rgb
-                    )
-                if 'right' in qr_border_sides:
-                    draw.rectangle(
-                        [h_padding + content_width - qr_border_width, y_qr,
-                         h_padding + content_width, y_qr + qr_height],
-                        fill=border_rgb
-                    )
-                if 'top' in qr_border_sides:
-                    draw.rectangle(
-                        [h_padding, y_qr, h_padding + content_width, y_qr + qr_border_width],
-                        fill=border_rgb
-                    )
-                if 'bottom' in qr_border_sides:
-                    draw.rectangle(
-                        [h_padding, y_qr + qr_height - qr_border_width,
-                         h_padding + content_width, y_qr + qr_height],
-                        fill=border_rgb
-                    )
-
-            # Draw QR code centered
-            qr_size = scale(cfg['qr_code_size_pt'])
-            qr_x = h_padding + (content_width - qr_size) // 2
-            qr_y_pos = y_qr + (qr_height - qr_size) // 2
-
-            with Image.open(qr_code_path) as qr_img:
-                qr_img = qr_img.convert('RGBA')
-                qr_img_resized = qr_img.resize((qr_size, qr_size), Image.Resampling.LANCZOS)
-                canvas.paste(qr_img_resized, (qr_x, qr_y_pos))
-
-            # 4. Draw message box
-            # White background
-            draw.rectangle(
-                [h_padding, y_message, h_padding + content_width, y_message + message_height],
-                fill='white'
+                text_padding=plan.text_padding,
+                allow_multiline=layout.name_multiline,
+                max_lines=plan.name_max_lines,
+                char_threshold=plan.name_length_threshold
             )
 
-            # Draw borders
-            msg_border_sides = cfg.get('message_box_border_sides', [])
-            msg_border_width = scale(cfg.get('message_box_border_width_pt', 2))
-            msg_border_color = cfg.get('message_box_border_color', '#000000')
-
-            if msg_border_sides:
-                border_rgb = self._hex_to_rgb(msg_border_color)
-                if 'left' in msg_border_sides:
-                    draw.rectangle(
-                        [h_padding, y_message, h_padding + msg_border_width, y_message + message_height],
-                        fill=border_rgb
-                    )
-                if 'right' in msg_border_sides:
-                    draw.rectangle(
-                        [h_padding + content_width - msg_border_width, y_message,
-                         h_padding + content_width, y_message + message_height],
-                        fill=border_rgb
-                    )
-                if 'top' in msg_border_sides:
-                    draw.rectangle(
-                        [h_padding, y_message, h_padding + content_width, y_message + msg_border_width],
-                        fill=border_rgb
-                    )
-                if 'bottom' in msg_border_sides:
-                    draw.rectangle(
-                        [h_padding, y_message + message_height - msg_border_width,
-                         h_padding + content_width, y_message + message_height],
-                        fill=border_rgb
-                    )
-
-            # Draw message text
-            message_font_size = scale(cfg['message_font_size_pt'])
-            self._draw_wrapped_text(
-                draw, cfg['message_text'],
-                h_padding, y_message,
-                content_width, message_height,
-                message_font_size,
-                text_padding=text_padding
-            )
+            # 3. Draw QR section (white background and borders), then the QR code centered
+            canvas.paste(plan.qr_box, (h_padding, layout.y_qr))
+            canvas.paste(self._qr_image, (plan.qr_x, layout.y_qr_code))
+
+            # 4. Draw message box (white background and borders, usually with the message)
+            canvas.paste(plan.message_box, (h_padding, layout.y_message))
+
+            # Draw message text, unless it is already part of the box
+            if not plan.message_prerendered:
+                self._draw_wrapped_text(
+                    draw, plan.message_text,
+                    h_padding, layout.y_message,
+                    content_width, plan.message_height,
+                    plan.message_font_size,
+                    text_padding=plan.text_padding
+                )
 
             # 5. Draw bottom box (if height > 0)
-            if bottom_box_height > 0:
-                bottom_h_margin = scale(cfg.get('bottom_box_horizontal_margin_pt', 0))
-                bottom_box_x = h_padding + bottom_h_margin
-                bottom_box_width = content_width - (2 * bottom_h_margin)
-
+            if plan.bottom_box_height > 0:
                 draw.rectangle(
-                    [bottom_box_x, y_bottom_box, bottom_box_x + bottom_box_width,
-                     y_bottom_box + bottom_box_height],
+                    [plan.bottom_box_x, layout.y_bottom_box,
+                     plan.bottom_box_x + plan.bottom_box_width,
+                     layout.y_bottom_box + plan.bottom_box_height],
                     fill='white'
                 )
 
-            # Save PNG
-            canvas.save(output_path, 'PNG', optimize=True)
-            print(f"  ✓ Successfully created: {output_path}")
+            # Save PNG, without the alpha channel when nothing is transparent
+            if canvas.getextrema()[3][0] == 255:
+                canvas = canvas.convert('RGB')
+            canvas.save(output_path, 'PNG', compress_level=plan.png_compress_level, optimize=False)
+            self._debug(f"  ✓ Successfully created: {output_path}")
             return True
 
         except Exception as e:
@@ -532,61 +640,101 @@ class PNGCardGenerator:
             traceback.print_exc()
             return False
 
-    def generate_all_cards(self) -> None:
-        """Generate PNG cards for all entries in CSV."""
-
-        # Create output directory
-        output_dir = self.base_dir / self.config['output_directory']
-        output_dir.mkdir(exist_ok=True)
+        finally:
+            person_image.close()
 
-        # Read CSV data
-        print("Reading CSV data...")
-        data = self._read_csv_data()
-        print(f"Found {len(data)} entries to process.\n")
+    def _generate_card_task(self, task: tuple) -> bool:
+        """Generate the card for one (idx, total, name, image, output_path) task."""
+        idx, total, person_name, person_image, output_path = task
+        print(f"[{idx}/{total}] Processing: {person_name}")
 
-        # Generate cards
-        success_count = 0
-        fail_count = 0
+        # Generate card
+        success = self.generate_card(person_name, person_image, output_path)
 
-        for idx, row in enumerate(data, 1):
-            person_name = row.get('name', '').strip()
-            person_image = row.get('image', '').strip()
+        self._debug("")
+        return success
 
+    def _iter_tasks(self, csv_path: Path, total: int, output_dir: Path, skipped: List[int]) -> Iterator[tuple]:
+        """Yield a card task per CSV row as it is read, recording rows with missing data in skipped."""
+        for idx, (person_name, person_image) in enumerate(self._read_csv_data(csv_path), 1):
             if not person_name or not person_image:
-                print(f"[{idx}/{len(data)}] Skipping row with missing data")
-                fail_count += 1
+                print(f"[{idx}/{total}] Skipping row with missing data")
+                skipped.append(idx)
                 continue
 
-            print(f"[{idx}/{len(data)}] Processing: {person_name}")
-
             # Generate output filename
             safe_name = self._sanitize_filename(person_name)
             output_filename = f"{safe_name}.png"
             output_path = output_dir / output_filename
 
-            # Generate card
-            if self.generate_card(person_name, person_image, str(output_path)):
-                success_count += 1
-            else:
-                fail_count += 1
+            yield (idx, total, person_name, person_image, str(output_path))
+
+    def generate_all_cards(self) -> None:
+        """Generate PNG cards for all entries in CSV."""
+
+        # Create output directory
+        output_dir = self.base_dir / self.config['output_directory']
+        output_dir.mkdir(exist_ok=True)
 
-            print()
+        # Count CSV rows up front; the rows themselves are streamed to the workers
+        print("Reading CSV data...")
+        csv_path = self._get_csv_path()
+        total = self._count_csv_rows(csv_path)
+        print(f"Found {total} entries to process.\n")
+
+        # Generate cards
+        skipped = []
+        tasks = self._iter_tasks(csv_path, total, output_dir, skipped)
+
+        # Cards are independent, so spread them across CPU cores
+        if total > 1:
+            workers = min(os.cpu_count() or 1, total)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.config, self.scale_factor, self.verbose)) as executor:
+                # Send tasks in chunks on large CSVs, but keep every worker busy on small ones
+                chunksize = max(1, total // (workers * 4))
+                results = list(executor.map(_generate_card_task, tasks, chunksize=chunksize))
+        else:
+            results = [self._generate_card_task(task) for task in tasks]
+
+        success_count = sum(results)
+        fail_count = len(skipped) + len(results) - success_count
 
         # Summary
         print("=" * 60)
         print(f"GENERATION COMPLETE")
-        print(f"  Total: {len(data)}")
+        print(f"  Total: {total}")
         print(f"  Success: {success_count}")
         print(f"  Failed: {fail_count}")
         print(f"  Output directory: {output_dir}")
         print("=" * 60)
 
 
+# Per-process generator for pool workers, built once from the parent's config
+_worker_generator = None
+
+
+def _init_worker(config: Dict, scale_factor: int, verbose: bool) -> None:
+    """Create the worker process's PNGCardGenerator."""
+    global _worker_generator
+    _worker_generator = PNGCardGenerator(scale_factor=scale_factor, config=config, verbose=verbose)
+
+
+def _generate_card_task(task: tuple) -> bool:
+    """Generate one card in a worker process."""
+    return _worker_generator._generate_card_task(task)
+
+
 def main():
     """Main entry point."""
 
-    # Check for arguments
-    config_file = sys.argv[1] if len(sys.argv) > 1 else "config.json"
+    parser = argparse.ArgumentParser(description='Generate PNG cards from a CSV file')
+    parser.add_argument('config', nargs='?', default='config.json',
+                        help='Path to configuration file (default: config.json)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Print per-card layout details')
+    args = parser.parse_args()
+    config_file = args.config
     scale_factor = 4  # 4x scale = 288 DPI equivalent
 
     print("=" * 60)
@@ -596,7 +744,7 @@ def main():
     print(f"Scale factor: {scale_factor}x (for high resolution)\n")
 
     # Create generator and run
-    generator = PNGCardGenerator(config_file, scale_factor)
+    generator = PNGCardGenerator(config_file, scale_factor, verbose=args.verbose)
     generator.generate_all_cards()
 
 
@@ -0,0 +1,106 @@
+"""Tests for the PDF card generator."""
+
+import json
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image, ImageDraw, ImageFile
+from reportlab import rl_config
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_cards import CardGenerator  # noqa: E402
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config.json'
+
+
+class CardGeneratorTestCase(unittest.TestCase):
+    """Builds cards from generated images in a temporary directory."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+        # A black and white QR-like pattern, saved as PNG
+        self.qr_path = self.tmp / 'qr.png'
+        qr = Image.new('RGB', (660, 660), 'white')
+        draw = ImageDraw.Draw(qr)
+        for row in range(33):
+            for col in range(33):
+                if (row * 7 + col * 3) % 5 < 2:
+                    draw.rectangle([col * 20, row * 20, col * 20 + 19, row * 20 + 19], fill='black')
+        qr.save(self.qr_path)
+
+        self.photo_paths = []
+        for idx, color in enumerate(('#C04040', '#40C040', '#4040C0')):
+            photo_path = self.tmp / f'person{idx}.jpg'
+            Image.new('RGB', (400, 600), color).save(photo_path)
+            self.photo_paths.append(photo_path)
+
+    def make_config(self, **overrides):
+        with open(CONFIG_PATH, 'r') as f:
+            config = json.load(f)
+        config.update(
+            qr_code_path=str(self.qr_path),
+            output_directory=str(self.tmp / 'output'),
+            background_color='#8DC5FE',
+        )
+        config.update(overrides)
+        return config
+
+
+class QRCodeTest(CardGeneratorTestCase):
+
+    def test_png_qr_code_is_decoded_once(self):
+        decoded = []
+        original_load = ImageFile.ImageFile.load
+
+        def counting_load(im):
+            # Only loads with pending tiles actually decode pixels
+            if im.tile and im.format == 'PNG':
+                decoded.append(getattr(im, 'filename', ''))
+            return original_load(im)
+
+        with mock.patch.object(ImageFile.ImageFile, 'load', counting_load):
+            generator = CardGenerator(config=self.make_config())
+            for idx, photo_path in enumerate(self.photo_paths):
+                output_path = self.tmp / f'card{idx}.pdf'
+                self.assertTrue(generator.generate_card(f'Person {idx}', str(photo_path), str(output_path)))
+                self.assertTrue(output_path.exists())
+
+        # The source file once, then the resized copy inside the shared reader once
+        self.assertEqual(decoded.count(str(self.qr_path)), 1)
+        self.assertEqual(len(decoded), 2)
+
+    def test_qr_code_is_resized_to_its_printed_size(self):
+        generator = CardGenerator(config=self.make_config(qr_code_size_pt=72, image_dpi=150))
+        self.assertEqual(generator._qr_reader.getSize(), (150, 150))
+        # A black and white source is embedded in grayscale
+        generator._qr_reader.getRGBData()
+        self.assertEqual(generator._qr_reader.mode, 'L')
+
+
+class WhiteBoxesTest(CardGeneratorTestCase):
+
+    def test_overlapping_boxes_are_filled(self):
+        # A negative gap makes the message box overlap the QR section
+        generator = CardGenerator(config=self.make_config(gap_before_message_pt=-10))
+        output_path = self.tmp / 'card.pdf'
+        # Uncompressed page content, to read the drawing operators back
+        with mock.patch.object(rl_config, 'pageCompression', 0):
+            self.assertTrue(generator.generate_card('Person', str(self.photo_paths[0]), str(output_path)))
+        content = output_path.read_bytes()
+
+        # The white boxes are one path of rectangles; even-odd (f*) would leave the overlap unfilled
+        white_fill = re.search(rb'1 1 1 rg\s+n((?: [-\d.]+){4} re)+\s+(f\*?)\s', content)
+        self.assertIsNotNone(white_fill)
+        self.assertEqual(white_fill.group(2), b'f')
+
+
+if __name__ == '__main__':
+    unittest.main()